@@ -1,10 +1,16 @@
 from .client import Client
+from .async_client import AsyncClient
+from .recipes import RecipeBook, load_recipes, load_godsword_recipes
 
 from .calculators import (
     decant,
+    scan_decants,
     high_alchemy,
+    scan_high_alchemy,
     combiner,
     best_flip,
+    rank_flips,
+    best_flip_stream,
     flip,
     create_planks,
     clean_herbs,
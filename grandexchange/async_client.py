@@ -0,0 +1,351 @@
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from grandexchange import endpoints
+from grandexchange.client import Client
+from grandexchange.constants import POOL_SIZE, CONCURRENCY, RATE_LIMIT, TIMESTEP_SECONDS
+from grandexchange.items import GrandExchangeItems, Offer, Price, Timeseries
+from grandexchange.snapshot import IntervalSnapshot, PriceSnapshot
+from grandexchange.store import StoredBars
+
+
+class RateLimiter:
+    """Token bucket that limits how many requests are started per second against a host"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        """Initialises the rate limiter
+
+        Parameters
+        ----------
+        rate: float
+            Number of requests allowed per second
+        burst: int
+            Number of requests that may be started at once after a quiet period
+        """
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Waits until a request is allowed to start"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncClient:
+    """Asynchronous client to interact with the Grand Exchange API
+
+    Requests are sent over the pooled session of a synchronous ``Client`` in a dedicated
+    pool of ``concurrency`` worker threads, so each call can be awaited and many calls can be fanned out concurrently.
+    The number of requests in flight is bounded by ``concurrency`` and the rate they are
+    started at is bounded by ``rate_limit`` for the server's host.
+    """
+
+    def __init__(
+            self,
+            user_agent: str,
+            server: str = endpoints.Servers.DEFAULT,
+            *,
+            concurrency: int = CONCURRENCY,
+            rate_limit: float = RATE_LIMIT,
+            **client_kwargs
+    ):
+        """Initialises the asynchronous Grand Exchange client
+
+        The item mapping is not loaded until it is first needed.
+
+        Parameters
+        ----------
+        user_agent: str
+            Discord ID or email for the Runescape Wiki API admins to reach out if you are
+            hitting the endpoint too much
+        server: str
+            Base URL for the API that will be checked, default is the original 2007 release
+        concurrency: int
+            Maximum number of requests in flight at once
+        rate_limit: float
+            Maximum number of requests started per second against the server's host
+        client_kwargs:
+            Additional keyword arguments and request headers given to ``Client``
+        """
+        client_kwargs.setdefault("pool_size", max(concurrency, POOL_SIZE))
+        self._client = Client(user_agent, server, lazy=True, **client_kwargs)
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._limiter = RateLimiter(rate_limit)
+        self._items_lock = asyncio.Lock()
+
+    @property
+    def items(self) -> GrandExchangeItems:
+        """Grand Exchange items from the mapping endpoint
+
+        Accessing the items before ``load_items`` has been awaited blocks on the download.
+        """
+        return self._client.items
+
+    async def close(self) -> None:
+        """Closes the pooled connections to the API and stops the worker threads"""
+        self._executor.shutdown(wait=False)
+        self._client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _run(self, func, *args):
+        """Runs a blocking client call in a worker thread under the concurrency and rate limits"""
+        async with self._semaphore:
+            await self._limiter.acquire()
+            return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(func, *args))
+
+    async def load_items(self) -> GrandExchangeItems:
+        """Loads the item mapping if it has not been loaded yet
+
+        Returns
+        -------
+        GrandExchangeItems
+        """
+        async with self._items_lock:
+            if self._client._items is None:
+                await self._run(lambda: self._client.items)
+        return self._client.items
+
+    async def get_current_prices(self, names: str | list[str] = None) -> list[Offer]:
+        """Fetches the latest prices of an item from the Grand Exchange API
+
+        See ``Client.get_current_prices``.
+
+        Parameters
+        ----------
+        names: str | list[str] (default = None)
+            Fetches all items if None is selected, else returns the given item ID(s)
+
+        Returns
+        -------
+        list[Offer]
+        """
+        await self.load_items()
+        return await self._run(self._client.get_current_prices, names)
+
+    async def get_current_prices_columnar(self) -> PriceSnapshot:
+        """Fetches the latest prices of all items into a columnar snapshot
+
+        See ``Client.get_current_prices_columnar``.
+
+        Returns
+        -------
+        PriceSnapshot
+        """
+        return await self._run(self._client.get_current_prices_columnar)
+
+    async def get_current_prices_by_id(self, ids: int | list[int] = None) -> dict[int, tuple[Price, Price]]:
+        """Fetches the latest highest and lowest prices by item ID without using the item mapping
+
+        See ``Client.get_current_prices_by_id``.
+
+        Parameters
+        ----------
+        ids: int | list[int] (default = None)
+            Fetches all items if None is selected, else returns the given item ID(s)
+
+        Returns
+        -------
+        dict[int, tuple[Price, Price]]
+        """
+        return await self._run(self._client.get_current_prices_by_id, ids)
+
+    async def get_timeseries_prices(self, name: str, timestep: str = "5m") -> Timeseries:
+        """Provides the latest 300 points of the highest and lowest prices of the given item at specific time
+
+        See ``Client.get_timeseries_prices``.
+
+        Parameters
+        ----------
+        name: str
+            Grand Exchange item name
+        timestep: str
+            Timestep parameter that must be one of: '5m', '1h', '6h'
+
+        Returns
+        -------
+        Timeseries
+        """
+        await self.load_items()
+        return await self._run(self._client.get_timeseries_prices, name, timestep)
+
+    async def get_timeseries_prices_many(
+            self,
+            names: list[str],
+            timestep: str = "5m"
+    ) -> tuple[dict[str, Timeseries], dict[str, BaseException]]:
+        """Fetches the timeseries of many items concurrently
+
+        A failure for one item is reported alongside the results rather than aborting the
+        whole batch, as in ``Client.get_timeseries_prices_batch``.
+
+        Parameters
+        ----------
+        names: list[str]
+            Grand Exchange item names
+        timestep: str
+            Timestep parameter that must be one of: '5m', '1h', '6h'
+
+        Returns
+        -------
+        tuple[dict[str, Timeseries], dict[str, BaseException]]
+            Timeseries keyed by item name, and the exception raised for each item that failed
+        """
+        await self.load_items()
+        names = list(dict.fromkeys(names))
+        results = await asyncio.gather(
+            *(self._run(self._client.get_timeseries_prices, name, timestep) for name in names),
+            return_exceptions=True,
+        )
+
+        timeseries = {}
+        failures = {}
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                failures[name] = result
+            else:
+                timeseries[name] = result
+
+        return timeseries, failures
+
+    async def get_latest_timeseries_prices(self, timestep: str = "5m", timestamp: int = None) -> list[Timeseries]:
+        """Gets the timeseries prices for all items at the given timestep
+
+        See ``Client.get_latest_timeseries_prices``.
+
+        Parameters
+        ----------
+        timestep: str
+            Timestep parameter must be one of: '5m', '1h', '6h'
+        timestamp: int (default = None)
+            Start of a past interval to fetch, the latest interval is fetched if None is selected
+
+        Returns
+        -------
+        list[Timeseries]
+        """
+        await self.load_items()
+        return await self._run(self._client.get_latest_timeseries_prices, timestep, timestamp)
+
+    async def get_latest_timeseries_prices_columnar(self, timestep: str = "5m", timestamp: int = None) -> IntervalSnapshot:
+        """Gets the average prices and volumes of all items at the given timestep into a columnar snapshot
+
+        See ``Client.get_latest_timeseries_prices_columnar``.
+
+        Parameters
+        ----------
+        timestep: str
+            Timestep parameter must be one of: '5m', '1h', '6h'
+        timestamp: int (default = None)
+            Start of a past interval to fetch, the latest interval is fetched if None is selected
+
+        Returns
+        -------
+        IntervalSnapshot
+        """
+        return await self._run(self._client.get_latest_timeseries_prices_columnar, timestep, timestamp)
+
+    def _backfill_interval(self, timestep: str, timestamp: int, directory: str | None) -> None:
+        """Fetches one interval and writes it out so it is not held until the backfill finishes
+
+        The client ingests the interval into its store. The interval file is written under
+        a temporary name and renamed so an interrupted write is never mistaken for a
+        complete interval.
+        """
+        snapshot = self._client.get_latest_timeseries_prices_columnar(timestep, timestamp)
+        if directory is not None:
+            partial = os.path.join(directory, f"{timestamp}.part.npz")
+            StoredBars.from_snapshots([snapshot]).save(partial)
+            os.replace(partial, os.path.join(directory, f"{timestamp}.npz"))
+
+    async def backfill(
+            self,
+            start: int,
+            end: int,
+            timestep: str = "5m",
+            path: str | os.PathLike = None
+    ) -> dict[int, BaseException]:
+        """Fetches every interval between two timestamps concurrently and writes each one as it arrives
+
+        Intervals are requested under the client's concurrency and rate limits. Each interval
+        is written to the client's store and to ``path`` as soon as it is fetched and then
+        dropped, so memory does not grow with the length of the range. Intervals that were
+        already written are not requested again, so an interrupted backfill can be resumed.
+        Read the bars back with ``TimeseriesStore.get_range`` or ``StoredBars.load``.
+
+        Parameters
+        ----------
+        start: int
+            Earliest timestamp included, rounded up to the start of an interval
+        end: int
+            Latest timestamp included
+        timestep: str
+            Timestep parameter must be one of: '5m', '1h', '6h'
+        path: str | os.PathLike (default = None)
+            Directory each interval is also written to as a compressed NumPy ``<timestamp>.npz``
+            file of columns, created if it does not exist
+
+        Returns
+        -------
+        dict[int, BaseException]
+            Exception raised for each interval that failed keyed by its timestamp
+
+        Raises
+        ------
+        ValueError
+            When the client has no store and no path is given, as the intervals would be lost
+        """
+        if timestep not in TIMESTEP_SECONDS:
+            raise ValueError(f"timestep must be in {TIMESTEP_SECONDS}")
+
+        store = self._client.store
+        if store is None and path is None:
+            raise ValueError("backfill needs a client with a store or a path to write the intervals to")
+
+        length = TIMESTEP_SECONDS[timestep]
+        timestamps = range(-(-start // length) * length, end + 1, length)
+
+        # An interval is complete once it has been written to every output
+        completed = None
+        if store is not None:
+            completed = store.completed_intervals(timestep, start, end)
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            written = {timestamp for timestamp in timestamps if os.path.exists(os.path.join(path, f"{timestamp}.npz"))}
+            completed = written if completed is None else completed & written
+        timestamps = [timestamp for timestamp in timestamps if timestamp not in completed]
+
+        directory = os.fspath(path) if path is not None else None
+        results = await asyncio.gather(
+            *(self._run(self._backfill_interval, timestep, timestamp, directory) for timestamp in timestamps),
+            return_exceptions=True,
+        )
+
+        return {
+            timestamp: result
+            for timestamp, result in zip(timestamps, results)
+            if isinstance(result, BaseException)
+        }
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from grandexchange.items import GrandExchangeItem
+
+
+@dataclass
+class MappingSnapshot:
+    """Compact copy of the /mapping catalog alongside the validators needed to revalidate it"""
+    columns: list[str]
+    rows: list[list]
+    fetched_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @classmethod
+    def from_items(cls, items: list[GrandExchangeItem], etag: str = None, last_modified: str = None):
+        """Creates a snapshot from parsed Grand Exchange items
+
+        Parameters
+        ----------
+        items: list[GrandExchangeItem]
+            Items parsed from the /mapping endpoint
+        etag: str
+            ETag header returned with the mapping
+        last_modified: str
+            Last-Modified header returned with the mapping
+
+        Returns
+        -------
+        MappingSnapshot
+        """
+        columns = list(GrandExchangeItem.__fields__)
+        rows = [[getattr(item, column) for column in columns] for item in items]
+        return cls(columns, rows, time.time(), etag, last_modified)
+
+    def to_items(self) -> list[GrandExchangeItem]:
+        """Rebuilds the Grand Exchange items without re-validating them
+
+        The rows were validated before being written to the snapshot so they are
+        constructed directly to keep warm starts fast.
+
+        Returns
+        -------
+        list[GrandExchangeItem]
+        """
+        return [GrandExchangeItem.construct(**dict(zip(self.columns, row))) for row in self.rows]
+
+    def validators(self) -> dict[str, str]:
+        """Returns the conditional request headers used to revalidate the snapshot
+
+        Returns
+        -------
+        dict[str, str]
+        """
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class MappingCache:
+    """On-disk cache of the /mapping catalog for a single server"""
+
+    def __init__(self, directory: str | os.PathLike, server: str, ttl: float):
+        """Initialises the mapping cache
+
+        Parameters
+        ----------
+        directory: str | os.PathLike
+            Directory where the snapshot is stored, it is created if it does not exist
+        server: str
+            Base URL of the API, each server is stored in its own file
+        ttl: float
+            Number of seconds a snapshot is used before it is revalidated against the API
+        """
+        digest = hashlib.sha1(server.encode()).hexdigest()[:12]
+        self.path = Path(directory) / f"mapping-{digest}.json"
+        self.ttl = ttl
+
+    def load(self) -> MappingSnapshot | None:
+        """Reads the snapshot from disk
+
+        Returns
+        -------
+        MappingSnapshot | None
+            None is returned if there is no snapshot or it could not be read
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return MappingSnapshot(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def save(self, snapshot: MappingSnapshot) -> None:
+        """Atomically writes the snapshot to disk
+
+        Parameters
+        ----------
+        snapshot: MappingSnapshot
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(snapshot.__dict__, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def is_fresh(self, snapshot: MappingSnapshot) -> bool:
+        """Returns true if the snapshot is younger than the TTL
+
+        Parameters
+        ----------
+        snapshot: MappingSnapshot
+
+        Returns
+        -------
+        bool
+        """
+        return time.time() - snapshot.fetched_at < self.ttl
+
+
+class SnapshotCache:
+    """Thread-safe in-process cache of parsed API responses keyed by their URL"""
+
+    def __init__(self):
+        self._entries: dict[str, tuple[float, object]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, ttl: float):
+        """Returns the cached value if it is younger than the TTL
+
+        Parameters
+        ----------
+        key: str
+            URL of the cached response
+        ttl: float
+            Maximum age in seconds of a value that can be returned
+
+        Returns
+        -------
+        object | None
+            None is returned if nothing is cached or the value is too old
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is None or time.monotonic() - entry[0] >= ttl:
+            return None
+        return entry[1]
+
+    def set(self, key: str, value) -> None:
+        """Stores the value against the key
+
+        Parameters
+        ----------
+        key: str
+            URL of the cached response
+        value: object
+            Parsed response being cached
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+
+    def clear(self) -> None:
+        """Removes every cached value"""
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by every client in the process so that clients for the same server share a download
+LATEST_CACHE = SnapshotCache()
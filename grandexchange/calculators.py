@@ -1,9 +1,23 @@
 import functools
+import heapq
 import inspect
-
-from grandexchange.items import Offer, Barrows
-from grandexchange.constants import SAWMILL_COSTS, PLANK_MAKE_COSTS, BARROWS, REPAIR_BARROWS_COSTS
-from grandexchange.transactions import SaleTransaction
+from dataclasses import dataclass, field
+from typing import Iterable
+
+import numpy as np
+
+from grandexchange.items import Offer, Barrows, GrandExchangeItems, dosage
+from grandexchange.constants import (
+    SAWMILL_COSTS,
+    PLANK_MAKE_COSTS,
+    ZAHURS_FEE,
+    WESLEYS_FEE,
+    BARROWS,
+    REPAIR_BARROWS_COSTS,
+    MISSING
+)
+from grandexchange.snapshot import PriceSnapshot
+from grandexchange.transactions import SaleTransaction, SaleRecord, calculate_profit_batch
 from grandexchange.exceptions import (
     ItemNotFoundError,
     IncorrectItemProvidedError,
@@ -12,37 +26,19 @@ from grandexchange.exceptions import (
 )
 
 
-def dosage(name: str) -> int:
-    """Finds the number of doses in the potion based off the name
-
-    Parses the last three characters of the potion name to determine the number of doses
+def _sale(fast: bool, **transaction) -> SaleTransaction | SaleRecord:
+    """Creates a SaleRecord if the fast path was requested, otherwise a SaleTransaction"""
+    if fast:
+        return SaleRecord.create(**transaction)
+    return SaleTransaction(**transaction)
 
-    Parameters
-    ----------
-    name: str
-        The name of the potion to be parsed. It must contain the ending dosage of the
-        potion otherwise an error will be raised.
 
-    Returns
-    -------
-    int:
-        The number of doses in the potion
-    """
-    match name[-3:]:
-        case "(1)":
-            dose = 1
-        case "(2)":
-            dose = 2
-        case "(3)":
-            dose = 3
-        case "(4)":
-            dose = 4
-        case _:
-            raise ValueError("The given name was not parsed as a potion")
-    return dose
-
-
-def decant(potions: list[Offer], starting_dose: int, volume: int) -> list[SaleTransaction]:
+def decant(
+        potions: list[Offer],
+        starting_dose: int,
+        volume: int,
+        fast: bool = False
+) -> list[SaleTransaction | SaleRecord]:
     """Calculates the end number of potions after being decanted
 
     Parameters
@@ -53,6 +49,8 @@ def decant(potions: list[Offer], starting_dose: int, volume: int) -> list[SaleTr
         The starting potion dosage to be used in the calculations
     volume: int
         Number of potions being decanted
+    fast: bool (default = False)
+        Returns a lightweight SaleRecord instead of a validated SaleTransaction
 
     Returns
     -------
@@ -62,14 +60,16 @@ def decant(potions: list[Offer], starting_dose: int, volume: int) -> list[SaleTr
     transactions = []
     sips = starting_dose * volume
 
-    for index, potion in enumerate(potions):
-        if (dose := dosage(potion.item.name)) == starting_dose:
-            starting_potion = potions[index]
-        potions[index].attributes['dose'] = dose
-
-    for potion in potions:
-        if (dose := potion.attributes['dose']) != starting_dose:
-            transactions.append(SaleTransaction(
+    doses = [dosage(potion.item.name) for potion in potions]
+    try:
+        starting_potion = potions[doses.index(starting_dose)]
+    except ValueError:
+        raise ValueError(f"No potion with a dose of {starting_dose} was provided")
+
+    for potion, dose in zip(potions, doses):
+        if dose != starting_dose:
+            transactions.append(_sale(
+                fast,
                 item=potion.item,
                 full_buy_price=(starting_potion.lowest.price + 1) * volume,
                 individual_sold_price=potion.highest.price - 1,
@@ -79,6 +79,119 @@ def decant(potions: list[Offer], starting_dose: int, volume: int) -> list[SaleTr
     return transactions
 
 
+@dataclass
+class DecantTable:
+    """Every decant of every potion family in a price snapshot, ranked by profit
+
+    Each row decants ``volume`` potions of the starting dose into the target dose of the
+    same family and is calculated in the same way as ``decant``.
+    """
+    family: np.ndarray
+    start_id: np.ndarray
+    target_id: np.ndarray
+    start_dose: np.ndarray
+    target_dose: np.ndarray
+    full_buy_price: np.ndarray
+    individual_sold_price: np.ndarray
+    volume: np.ndarray
+    profit: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.profit)
+
+    def sales(self, items: GrandExchangeItems, fast: bool = False) -> list[SaleTransaction | SaleRecord]:
+        """Creates the sale of each row, in the same form as returned by ``decant``
+
+        Parameters
+        ----------
+        items: GrandExchangeItems
+            Item mapping used to find the target potions' details
+        fast: bool (default = False)
+            Returns a lightweight SaleRecord instead of a validated SaleTransaction
+
+        Returns
+        -------
+        list[SaleTransaction | SaleRecord]
+        """
+        return [
+            _sale(fast, item=item, full_buy_price=buy, individual_sold_price=sell, volume=volume)
+            for item, buy, sell, volume in zip(
+                items.get_items_by_ids(self.target_id.tolist()),
+                self.full_buy_price.tolist(),
+                self.individual_sold_price.tolist(),
+                self.volume.tolist(),
+            )
+        ]
+
+
+def scan_decants(
+        snapshot: PriceSnapshot,
+        items: GrandExchangeItems,
+        volume: int = 1,
+        top_n: int = None
+) -> DecantTable:
+    """Calculates every decant between the doses of every potion family in a price snapshot
+
+    Potions are grouped into families with the potion family index of the item mapping and
+    found in the snapshot by their ID. Every starting to target dose conversion of every
+    family is then calculated at once. Neither the snapshot nor the items are changed.
+
+    Parameters
+    ----------
+    snapshot: PriceSnapshot
+        Latest prices of the potions
+    items: GrandExchangeItems
+        Item mapping used to find the potions' names
+    volume: int
+        Number of starting potions bought for each decant
+    top_n: int (default = None)
+        Number of rows returned, all rows are returned if None is selected
+
+    Returns
+    -------
+    DecantTable
+        Rows ordered by descending profit, ties keep the family order of the item mapping
+    """
+    families = items.potion_families()
+
+    # Row of each dose of each family in the snapshot, -1 where the snapshot has no such dose
+    names = np.array(list(families), dtype=object)
+    rows = np.full((len(families), 4), -1, dtype=np.intp)
+    for family, doses in enumerate(families.values()):
+        for dose, item in doses.items():
+            if (row := snapshot.row(item.id)) is not None:
+                rows[family, dose - 1] = row
+
+    present = rows >= 0
+    low = np.full(rows.shape, MISSING, dtype=np.int64)
+    high = np.full(rows.shape, MISSING, dtype=np.int64)
+    low[present] = snapshot.low[rows[present]]
+    high[present] = snapshot.high[rows[present]]
+
+    # Every (family, start, target) combination with start != target, in family then dose order
+    family, start, target = np.nonzero(~np.eye(4, dtype=bool)[np.newaxis].repeat(len(rows), axis=0))
+    valid = (low[family, start] != MISSING) & (high[family, target] != MISSING)
+    family, start, target = family[valid], start[valid], target[valid]
+
+    full_buy_price = (low[family, start] + 1) * volume
+    individual_sold_price = high[family, target] - 1
+    sold = (start + 1) * volume // (target + 1)
+    profit = calculate_profit_batch(full_buy_price, individual_sold_price, sold)
+
+    order = np.lexsort((np.arange(len(profit)), -profit))[:top_n]
+    return DecantTable(
+        family=names[family[order]],
+        start_id=snapshot.ids[rows[family[order], start[order]]],
+        target_id=snapshot.ids[rows[family[order], target[order]]],
+        start_dose=start[order] + 1,
+        target_dose=target[order] + 1,
+        full_buy_price=full_buy_price[order],
+        individual_sold_price=individual_sold_price[order],
+        volume=sold[order],
+        profit=profit[order],
+    )
+
+
 def high_alchemy(nature_rune: Offer, alchable: Offer, volume: int = 1) -> float:
     """Calculates the profit of casting high alchemy on the item
 
@@ -99,7 +212,81 @@ def high_alchemy(nature_rune: Offer, alchable: Offer, volume: int = 1) -> float:
     return high_alch_return - cost
 
 
-def combiner(parts: list[Offer], product: Offer, volume: int = 1) -> SaleTransaction:
+@dataclass
+class AlchemyTable:
+    """High alchemy profit of many items, ranked by the total profit of casting up to the buy limit"""
+    ids: np.ndarray
+    buy_price: np.ndarray
+    high_alch: np.ndarray
+    volume: np.ndarray
+    profit: np.ndarray
+    total_profit: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def scan_high_alchemy(
+        nature_rune_price: int,
+        snapshot: PriceSnapshot,
+        items: GrandExchangeItems,
+        volume: int = None,
+        top_n: int = 10
+) -> AlchemyTable:
+    """Calculates the high alchemy profit of every item in a price snapshot
+
+    Each cast is calculated in the same way as ``high_alchemy``. The number of casts of each
+    item is capped at its buy limit. Items without a high alchemy value or a lowest price, or
+    missing from the item mapping, are skipped.
+
+    Parameters
+    ----------
+    nature_rune_price: int
+        Lowest price of a nature rune
+    snapshot: PriceSnapshot
+        Latest prices of the items being alched
+    items: GrandExchangeItems
+        Item mapping used to find the items' high alchemy values and buy limits
+    volume: int (default = None)
+        Number of casts of each item before the buy limit is applied. Every item is cast up
+        to its buy limit if None is selected, an item without a buy limit is then cast once
+    top_n: int
+        Number of items returned
+
+    Returns
+    -------
+    AlchemyTable
+        Items ordered by descending total profit, ties keep the snapshot order
+    """
+    catalog = items.columns()
+    rows, known = catalog.rows(snapshot.ids)
+    high_alch = catalog.high_alch[rows]
+    limit = catalog.limit[rows]
+
+    valid = known & (high_alch != MISSING) & (snapshot.low != MISSING)
+    found = np.flatnonzero(valid)
+    high_alch, limit = high_alch[found], limit[found]
+
+    buy_price = snapshot.low[found] + 1
+    profit = high_alch - (nature_rune_price + 1 + buy_price)
+
+    casts = np.where(limit != MISSING, limit, 1 if volume is None else volume)
+    if volume is not None:
+        casts = np.minimum(casts, volume)
+    total_profit = profit * casts
+
+    order = np.lexsort((found, -total_profit))[:top_n]
+    return AlchemyTable(
+        ids=snapshot.ids[found[order]],
+        buy_price=buy_price[order],
+        high_alch=high_alch[order],
+        volume=casts[order],
+        profit=profit[order],
+        total_profit=total_profit[order],
+    )
+
+
+def combiner(parts: list[Offer], product: Offer, volume: int = 1, fast: bool = False) -> SaleTransaction | SaleRecord:
     """Calculates the total profit from combining the items into the final product.
 
     Examples include Godswords, Dragonfire shields.
@@ -111,13 +298,16 @@ def combiner(parts: list[Offer], product: Offer, volume: int = 1) -> SaleTransac
     product: Offer
         The end product made after combining the items
     volume: int
+    fast: bool (default = False)
+        Returns a lightweight SaleRecord instead of a validated SaleTransaction
 
     Returns
     -------
-    SaleTransaction
+    SaleTransaction | SaleRecord
     """
     cost = sum(volume * (part.lowest.price + 1) for part in parts)
-    return SaleTransaction(
+    return _sale(
+        fast,
         item=product.item,
         full_buy_price=cost,
         individual_sold_price=product.highest.price + 1,
@@ -125,7 +315,12 @@ def combiner(parts: list[Offer], product: Offer, volume: int = 1) -> SaleTransac
     )
 
 
-def best_flip(items: list[Offer], volume: int = 1, top_n: int = 10) -> list[SaleTransaction]:
+def best_flip(
+        items: list[Offer],
+        volume: int = 1,
+        top_n: int = 10,
+        fast: bool = False
+) -> list[SaleTransaction | SaleRecord]:
     """Returns the best top n flips from
 
     Parameters
@@ -133,31 +328,156 @@ def best_flip(items: list[Offer], volume: int = 1, top_n: int = 10) -> list[Sale
     items
     volume
     top_n
+    fast: bool (default = False)
+        Returns a lightweight SaleRecord instead of a validated SaleTransaction
 
     Returns
     -------
-    list[SaleTransaction]
+    list[SaleTransaction | SaleRecord]
     """
-    flips = [flip(item, volume) for item in items]
+    flips = [flip(item, volume, fast) for item in items]
     flips.sort(reverse=True)
 
     return flips[0:top_n]
 
 
-def flip(offer: Offer, volume: int = 1) -> SaleTransaction:
+@dataclass
+class FlipRanking:
+    """Best flips found in a stream of offers and the number of offers skipped for having no usable price"""
+    flips: list[SaleTransaction | SaleRecord] = field(default_factory=list)
+    skipped: int = 0
+
+
+def best_flip_stream(offers: Iterable[Offer], volume: int = 1, top_n: int = 10, fast: bool = False) -> FlipRanking:
+    """Returns the best top n flips from a stream of offers
+
+    Only the best n flips seen so far are held in a min-heap so memory does not grow with
+    the number of offers. Offers without a highest or lowest price, or with a highest price
+    too low to sell at, are skipped and counted instead of raising an error.
+
+    Parameters
+    ----------
+    offers: Iterable[Offer]
+        Offers being ranked, for example a generator over a price snapshot
+    volume: int
+        Number of items bought and sold in each flip
+    top_n: int
+        Number of flips returned
+    fast: bool (default = False)
+        Returns a lightweight SaleRecord instead of a validated SaleTransaction
+
+    Returns
+    -------
+    FlipRanking
+        Flips ordered by descending profit, ties keep the order they were streamed in
+    """
+    ranking = FlipRanking()
+    heap = []
+
+    for position, offer in enumerate(offers):
+        # Selling below the highest price would need a negative price, as rank_flips skips
+        if offer.highest.price is not None and offer.highest.price < 1:
+            ranking.skipped += 1
+            continue
+
+        try:
+            sale = flip(offer, volume, fast)
+        except PriceNotAvailableError:
+            ranking.skipped += 1
+            continue
+
+        # Later offers sort below earlier offers of the same profit so the earlier one is kept
+        entry = (sale.profit, -position, sale)
+        if len(heap) < top_n:
+            heapq.heappush(heap, entry)
+        elif top_n > 0 and entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    ranking.flips = [sale for *_, sale in sorted(heap, key=lambda x: x[:2], reverse=True)]
+    return ranking
+
+
+def rank_flips(
+        snapshot: PriceSnapshot,
+        items: GrandExchangeItems,
+        volume: int = 1,
+        top_n: int = 10,
+        fast: bool = False
+) -> list[SaleTransaction | SaleRecord]:
+    """Returns the best top n flips across a whole price snapshot
+
+    The margin, tax and profit of every item are calculated at once in the same way as
+    ``flip``. Only the top n are selected with a partial sort and turned into sale
+    transactions. Items without both prices, or missing from the item mapping, are skipped.
+
+    Parameters
+    ----------
+    snapshot: PriceSnapshot
+        Latest prices of the items being ranked
+    items: GrandExchangeItems
+        Item mapping used to find the items' details
+    volume: int
+        Number of items bought and sold in each flip
+    top_n: int
+        Number of flips returned
+    fast: bool (default = False)
+        Returns a lightweight SaleRecord instead of a validated SaleTransaction
+
+    Returns
+    -------
+    list[SaleTransaction | SaleRecord]
+        Flips ordered by descending profit
+    """
+    _, known = items.columns().rows(snapshot.ids)
+
+    buy = snapshot.low + 1
+    sell = snapshot.high - 1
+    valid = known & (snapshot.low != MISSING) & (snapshot.high != MISSING) & (sell >= 0)
+
+    rows = np.flatnonzero(valid)
+    if top_n <= 0 or len(rows) == 0:
+        return []
+
+    profit = calculate_profit_batch(buy[rows], sell[rows], volume)
+
+    # Keeps every row at least as profitable as the n-th best so ties at the cut are all
+    # kept, then orders them by profit with ties in the snapshot order
+    if top_n < len(rows):
+        kth = np.partition(profit, len(rows) - top_n)[len(rows) - top_n]
+        best = np.flatnonzero(profit >= kth)
+    else:
+        best = np.arange(len(rows))
+    best = best[np.lexsort((best, -profit[best]))][:top_n]
+
+    return [
+        _sale(
+            fast,
+            item=items.get_item_by_id(int(snapshot.ids[row])),
+            full_buy_price=int(buy[row]),
+            individual_sold_price=int(sell[row]),
+            volume=volume
+        )
+        for row in rows[best]
+    ]
+
+
+def flip(offer: Offer, volume: int = 1, fast: bool = False) -> SaleTransaction | SaleRecord:
     """Calculates the profit from buying at the lowest price and selling at the highest
 
     Parameters
     ----------
     offer: GrandExchange Offer
     volume: int
+    fast: bool (default = False)
+        Returns a lightweight SaleRecord instead of a validated SaleTransaction
 
     Returns
     -------
-    SaleTransaction
+    SaleTransaction | SaleRecord
     """
     try:
-        return SaleTransaction(
+        return _sale(
+            fast,
             item=offer.item,
             full_buy_price=offer.lowest.price + 1,
             individual_sold_price=offer.highest.price - 1,
@@ -169,11 +489,13 @@ def flip(offer: Offer, volume: int = 1) -> SaleTransaction:
         raise err
 
 
-ZAHURS_FEE = 200
-WESLEYS_FEE = 50
-
-
-def transform(material: Offer, product: Offer, volume: int, fee: int = 0) -> SaleTransaction:
+def transform(
+        material: Offer,
+        product: Offer,
+        volume: int,
+        fee: int = 0,
+        fast: bool = False
+) -> SaleTransaction | SaleRecord:
     """Calculates the profit from converting an item to another product, for example, cleaning herbs
 
     Parameters
@@ -185,15 +507,18 @@ def transform(material: Offer, product: Offer, volume: int, fee: int = 0) -> Sal
     volume: int
     fee: int
         The fee required to pay for the conversion
+    fast: bool (default = False)
+        Returns a lightweight SaleRecord instead of a validated SaleTransaction
 
     Returns
     -------
-    SaleTransaction
+    SaleTransaction | SaleRecord
     """
     cost = volume * (material.lowest.price + 1)
     fees = volume * fee
 
-    return SaleTransaction(
+    return _sale(
+        fast,
         item=product.item,
         full_buy_price=cost + fees,
         individual_sold_price=product.highest.price - 1,
@@ -202,23 +527,24 @@ def transform(material: Offer, product: Offer, volume: int, fee: int = 0) -> Sal
 
 
 def create_planks(log: Offer, plank: Offer, volume: int,
-                  method: SAWMILL_COSTS | PLANK_MAKE_COSTS = SAWMILL_COSTS) -> SaleTransaction:
+                  method: SAWMILL_COSTS | PLANK_MAKE_COSTS = SAWMILL_COSTS,
+                  fast: bool = False) -> SaleTransaction | SaleRecord:
     try:
-        return transform(log, plank, volume, method[log.item.name])
+        return transform(log, plank, volume, method[log.item.name], fast)
     except KeyError:
         raise ItemNotFoundError(log.item, method.values())
 
 
-def clean_herbs(grimy: Offer, clean: Offer, volume: int) -> SaleTransaction:
-    return transform(grimy, clean, volume, ZAHURS_FEE)
+def clean_herbs(grimy: Offer, clean: Offer, volume: int, fast: bool = False) -> SaleTransaction | SaleRecord:
+    return transform(grimy, clean, volume, ZAHURS_FEE, fast)
 
 
-def create_unfinished(herb: Offer, unfinished: Offer, volume: int) -> SaleTransaction:
-    return transform(herb, unfinished, volume, ZAHURS_FEE)
+def create_unfinished(herb: Offer, unfinished: Offer, volume: int, fast: bool = False) -> SaleTransaction | SaleRecord:
+    return transform(herb, unfinished, volume, ZAHURS_FEE, fast)
 
 
-def crush(material: Offer, product: Offer, volume: int) -> SaleTransaction:
-    return transform(material, product, volume, WESLEYS_FEE)
+def crush(material: Offer, product: Offer, volume: int, fast: bool = False) -> SaleTransaction | SaleRecord:
+    return transform(material, product, volume, WESLEYS_FEE, fast)
 
 
 def check_skill_level(func):
@@ -239,7 +565,13 @@ def check_skill_level(func):
 
 
 @check_skill_level
-def repair_barrows(repaired: Offer, degraded: Offer, level: int = 1, volume: int = 1) -> SaleTransaction:
+def repair_barrows(
+        repaired: Offer,
+        degraded: Offer,
+        level: int = 1,
+        volume: int = 1,
+        fast: bool = False
+) -> SaleTransaction | SaleRecord:
     """Calculates the return of repairing a Barrows item
 
     Repair costs are determined by using the repair bench in a player's home. Default
@@ -256,10 +588,12 @@ def repair_barrows(repaired: Offer, degraded: Offer, level: int = 1, volume: int
         Smithing level of the player
     volume:
         Total volume of items being repaired and sold
+    fast: bool (default = False)
+        Returns a lightweight SaleRecord instead of a validated SaleTransaction
 
     Returns
     -------
-    SaleTransaction
+    SaleTransaction | SaleRecord
 
     Raises:
         IncorrectItemProvidedError: When the repair item does not match the degraded item
@@ -279,7 +613,8 @@ def repair_barrows(repaired: Offer, degraded: Offer, level: int = 1, volume: int
 
     repair_cost = (1 - (level / 200)) * default_cost * volume
 
-    return SaleTransaction(
+    return _sale(
+        fast,
         item=repaired.item,
         full_buy_price=degraded.lowest.price * volume + repair_cost + 1,
         individual_sold_price=repaired.highest.price + 1,
@@ -294,7 +629,8 @@ def repair_barrows_set(
         set_: Offer,
         level: int = 1,
         volume: int = 1,
-) -> SaleTransaction:
+        fast: bool = False
+) -> SaleTransaction | SaleRecord:
     """Calculates the return of repairing a barrows set and selling the combined set
 
     Parameters
@@ -309,12 +645,14 @@ def repair_barrows_set(
         Smithing level of the player
     volume:
         Total volume of items being repaired and sold
+    fast: bool (default = False)
+        Returns a lightweight SaleRecord instead of a validated SaleTransaction
 
     Returns
     -------
-    SaleTransaction
+    SaleTransaction | SaleRecord
     """
-    sales: list[SaleTransaction] = []
+    sales: list[SaleTransaction | SaleRecord] = []
 
     names = [piece.item.name + " 0" for piece in repaired]
     for piece in degraded:
@@ -324,12 +662,13 @@ def repair_barrows_set(
             raise ValueError("Degraded and repaired items do not match")
 
         sales.append(
-            repair_barrows(repaired[index], piece, level, volume)
+            repair_barrows(repaired[index], piece, level, volume, fast)
         )
 
     cost = sum(sale.full_buy_price for sale in sales)
 
-    return SaleTransaction(
+    return _sale(
+        fast,
         item=set_.item,
         full_buy_price=cost,
         individual_sold_price=set_.highest.price - 1,
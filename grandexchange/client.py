@@ -1,15 +1,39 @@
+import os
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+from email.utils import parsedate_to_datetime
+
+import numpy as np
 import requests
 import time
-
-from grandexchange.constants import VALID_TIMESTEPS
+from requests.adapters import HTTPAdapter
+
+from grandexchange.constants import (
+    VALID_TIMESTEPS,
+    TIMESTEP_SECONDS,
+    MAPPING_CACHE_TTL,
+    POOL_SIZE,
+    CONNECT_TIMEOUT,
+    READ_TIMEOUT,
+    RETRIES,
+    BACKOFF_FACTOR,
+    MAX_BACKOFF,
+    RETRY_STATUSES,
+)
+from grandexchange.cache import MappingCache, MappingSnapshot, LATEST_CACHE
 
 from grandexchange.exceptions import MalformedResponseError
 from grandexchange import endpoints
+from grandexchange.snapshot import IntervalSnapshot, PriceSnapshot, LatestDelta
+from grandexchange.store import TimeseriesStore
 from grandexchange.items import (
     GrandExchangeItem,
     GrandExchangeItems,
     Price,
     Offer,
+    PriceSeries,
     Timeseries,
 )
 
@@ -17,7 +41,22 @@ from grandexchange.items import (
 class Client:
     """Client to interact with the Grand Exchange API"""
 
-    def __init__(self, user_agent: str, server: str = endpoints.Servers.DEFAULT, **request_headers):
+    def __init__(
+            self,
+            user_agent: str,
+            server: str = endpoints.Servers.DEFAULT,
+            *,
+            cache_dir: str | os.PathLike = None,
+            cache_ttl: float = MAPPING_CACHE_TTL,
+            lazy: bool = False,
+            latest_ttl: float = 0,
+            store: TimeseriesStore = None,
+            pool_size: int = POOL_SIZE,
+            timeout: tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT),
+            retries: int = RETRIES,
+            backoff_factor: float = BACKOFF_FACTOR,
+            **request_headers
+    ):
         """Initialises the Grand Exchange client
 
         Parameters
@@ -27,15 +66,113 @@ class Client:
             hitting the endpoint too much
         server: str
             Base URL for the API that will be checked, default is the original 2007 release
+        cache_dir: str | os.PathLike (default = None)
+            Directory to keep a local snapshot of the item mapping. The mapping is downloaded
+            on every start if no directory is given
+        cache_ttl: float
+            Number of seconds the local mapping snapshot is used before it is revalidated
+            against the API
+        lazy: bool (default = False)
+            Defers loading the item mapping until ``items`` is first accessed
+        latest_ttl: float (default = 0)
+            Number of seconds a downloaded /latest snapshot is reused by price requests. The
+            snapshot is shared by every client of the same server in the process. Disabled
+            by default
+        store: TimeseriesStore (default = None)
+            Local store that every downloaded timeseries and /5m or /1h snapshot is added to,
+            allowing history beyond the latest 300 points to be read back
+        pool_size: int
+            Maximum number of keep-alive connections held open to the API
+        timeout: tuple[float, float]
+            Connect and read timeouts in seconds for each request
+        retries: int
+            Number of times a request is retried after a connection error, timeout or a
+            429 / 5xx response
+        backoff_factor: float
+            Base delay in seconds of the jittered exponential backoff between retries. The
+            Retry-After header takes precedence when the API provides one
         request_headers:
             Additional headers that can be provided when sending HTTP requests
         """
         self._headers = {"user-agent": user_agent, **request_headers}
+        self._latest_ttl = latest_ttl
+        self.store = store
+        self._pool_size = pool_size
+        self._timeout = timeout
+        self._retries = retries
+        self._backoff_factor = backoff_factor
+
+        self._session = requests.Session()
+        self._session.headers.update(self._headers)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
         self._endpoints = endpoints.URL(server)
-        self.items = GrandExchangeItems(items=self._mapping())
+        self._mapping_cache = MappingCache(cache_dir, server, cache_ttl) if cache_dir is not None else None
+        self._items = None
+        self._items_lock = threading.Lock()
+
+        if not lazy:
+            self._items = GrandExchangeItems.from_items(self._mapping())
+
+    @property
+    def items(self) -> GrandExchangeItems:
+        """Grand Exchange items from the mapping endpoint, loaded on first access in lazy mode"""
+        if self._items is None:
+            with self._items_lock:
+                if self._items is None:
+                    self._items = GrandExchangeItems.from_items(self._mapping())
+        return self._items
+
+    @items.setter
+    def items(self, items: GrandExchangeItems):
+        self._items = items
+
+    def close(self) -> None:
+        """Closes the pooled connections to the API"""
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _retry_delay(self, attempt: int, response: requests.Response = None) -> float:
+        """Number of seconds to wait before the next attempt
+
+        Uses the Retry-After header if the API provided one, otherwise a full jitter
+        exponential backoff capped at ``MAX_BACKOFF``.
+
+        Parameters
+        ----------
+        attempt: int
+            Zero-based number of the attempt that failed
+        response: requests.Response
+            The response of the failed attempt, if one was received
+
+        Returns
+        -------
+        float
+        """
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after is not None:
+            try:
+                return min(max(float(retry_after), 0), MAX_BACKOFF)
+            except ValueError:
+                try:
+                    return min(max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0), MAX_BACKOFF)
+                except (TypeError, ValueError):
+                    pass
 
-    def _send_request(self, url: str, params: dict = None) -> requests.Response:
-        """Sends the request to the API endpoint
+        return random.uniform(0, min(self._backoff_factor * 2 ** attempt, MAX_BACKOFF))
+
+    def _send_request(self, url: str, params: dict = None, headers: dict = None) -> requests.Response:
+        """Sends the request to the API endpoint over the pooled session
+
+        Connection errors, timeouts and 429 / 5xx responses are retried before an error is
+        raised.
 
         Parameters
         ----------
@@ -43,18 +180,57 @@ class Client:
             The endpoint URL to send a request
         params: dict
             Key, value pairs of the parameters given to the request
+        headers: dict
+            Additional headers for this request only
 
         Returns
         -------
         requests.Response
         """
-        try:
-            r = requests.get(url, params=params, headers=self._headers)
+        attempt = 0
+        while True:
+            try:
+                r = self._session.get(url, params=params, headers=headers, timeout=self._timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= self._retries:
+                    raise
+                time.sleep(self._retry_delay(attempt))
+                attempt += 1
+                continue
+
+            if r.status_code in RETRY_STATUSES and attempt < self._retries:
+                time.sleep(self._retry_delay(attempt, r))
+                attempt += 1
+                continue
+
             r.raise_for_status()
-        except requests.exceptions.HTTPError as err:
-            raise err
+            return r
+
+    def _latest(self, use_cache: bool = True) -> dict[str, dict]:
+        """Fetches the latest prices of all items, reusing a recent snapshot when a TTL is set
+
+        Parameters
+        ----------
+        use_cache: bool (default = True)
+            Whether a cached snapshot can be returned, a downloaded snapshot is always cached
+
+        Returns
+        -------
+        dict[str, dict]
+            Price data keyed by the item ID as returned by the API
+        """
+        url = self._endpoints.latest
+
+        if use_cache and self._latest_ttl > 0 and (contents := LATEST_CACHE.get(url, self._latest_ttl)) is not None:
+            return contents
+
+        r = self._send_request(url)
+        contents = r.json()["data"]
+
+        if self._latest_ttl > 0:
+            LATEST_CACHE.set(url, contents)
 
-        return r
+        return contents
 
     def get_current_prices(self, names: str | list[str] = None) -> list[Offer]:
         """Fetches the latest prices of an item from the Grand Exchange API
@@ -65,7 +241,8 @@ class Client:
         If no ID or a list of IDs are given then all items are fetched due to caching
         that the API provides. The response is filtered to retrieve the list of IDs that
         were provided, otherwise all items prices are returned. There is caching on the
-        server side which will return a stale transaction of at least 60 seconds.
+        server side which will return a stale transaction of at least 60 seconds. Setting
+        ``latest_ttl`` on the client lets repeated calls filter the same downloaded snapshot.
 
         Parameters
         ----------
@@ -77,47 +254,121 @@ class Client:
         list[Offer]
         """
         prices = []
+        contents = self._latest()
 
-        r = self._send_request(self._endpoints.latest)
-        contents = r.json()["data"]
-
-        names = [names] if isinstance(names, str) else names
         if names is not None:
-            ids = [item.id for item in self.items.items if item.name in names]
+            # Looks up each requested item in the response directly by its ID
+            names = [names] if isinstance(names, str) else names
+            items = (self.items.get_item_by_name(name) for name in dict.fromkeys(names))
+            rows = ((item, contents.get(str(item.id))) for item in items if item is not None)
         else:
-            ids = [item.id for item in self.items.items]
+            # Item ID from the API is returned as a string and needs to be converted to integer before
+            # finding the item
+            rows = ((self.items.get_item_by_id(int(identity)), values) for identity, values in contents.items())
 
-        # Item ID from the API is returned as a string and needs to be converted to integer before filtering
-        # the data into an Offer dataclass
-        for identity, values in contents.items():
-            try:
-                identity = int(identity)
-            except ValueError('could not parse item ID from the API response') as err:
-                raise err
-
-            # Checks whether the item list is None to return all prices, or selectively returns the inputted items
-            if identity not in ids:
+        for item, values in rows:
+            if item is None or values is None:
                 continue
 
-            match values:
-                case {
-                    'highTime': high_timestamp,
-                    'high': high_price,
-                    'lowTime': low_timestamp,
-                    'low': low_price
-                }:
-                    offer = Offer(
-                        item=self.items.get_item_by_id(identity),
-                        highest=Price(timestamp=high_timestamp, price=high_price),
-                        lowest=Price(timestamp=low_timestamp, price=low_price)
-                    )
-                case _:
-                    raise MalformedResponseError()
-
-            prices.append(offer)
+            highest, lowest = self._parse_latest(values)
+            prices.append(Offer(item=item, highest=highest, lowest=lowest))
 
         return prices
 
+    def get_current_prices_columnar(self) -> PriceSnapshot:
+        """Fetches the latest prices of all items into a columnar snapshot
+
+        The snapshot is filled directly from the response without creating an Offer for
+        each item and does not need the item mapping.
+
+        Returns
+        -------
+        PriceSnapshot
+        """
+        return PriceSnapshot.from_latest(self._latest())
+
+    def watch_latest(self, interval: float = 60, polls: int = None) -> Iterator[LatestDelta]:
+        """Polls the latest prices and yields only the entries that changed since the previous poll
+
+        The first poll yields every entry. Each poll downloads a new snapshot regardless of
+        ``latest_ttl``.
+
+        Parameters
+        ----------
+        interval: float
+            Number of seconds between the start of each poll
+        polls: int (default = None)
+            Number of polls before the generator stops, polls forever if None is selected
+
+        Yields
+        ------
+        LatestDelta
+        """
+        previous = PriceSnapshot.from_latest({})
+        count = 0
+
+        while polls is None or count < polls:
+            started = time.monotonic()
+            snapshot = PriceSnapshot.from_latest(self._latest(use_cache=False))
+
+            yield LatestDelta(changes=snapshot.changed_since(previous), snapshot=snapshot, polled_at=time.time())
+
+            previous = snapshot
+            count += 1
+            if polls is None or count < polls:
+                time.sleep(max(interval - (time.monotonic() - started), 0))
+
+    @staticmethod
+    def _parse_latest(values: dict) -> tuple[Price, Price]:
+        """Parses the highest and lowest prices of a single item from the /latest response
+
+        Parameters
+        ----------
+        values: dict
+            Price data of a single item
+
+        Returns
+        -------
+        tuple[Price, Price]
+        """
+        match values:
+            case {
+                'highTime': high_timestamp,
+                'high': high_price,
+                'lowTime': low_timestamp,
+                'low': low_price
+            }:
+                return (
+                    Price(timestamp=high_timestamp, price=high_price),
+                    Price(timestamp=low_timestamp, price=low_price),
+                )
+            case _:
+                raise MalformedResponseError()
+
+    def get_current_prices_by_id(self, ids: int | list[int] = None) -> dict[int, tuple[Price, Price]]:
+        """Fetches the latest highest and lowest prices by item ID without using the item mapping
+
+        Parameters
+        ----------
+        ids: int | list[int] (default = None)
+            Fetches all items if None is selected, else returns the given item ID(s)
+
+        Returns
+        -------
+        dict[int, tuple[Price, Price]]
+            The highest and lowest price keyed by the item ID. IDs missing from the response
+            are not included
+        """
+        contents = self._latest()
+
+        if ids is None:
+            rows = ((int(identity), values) for identity, values in contents.items())
+        else:
+            ids = [ids] if isinstance(ids, int) else ids
+            rows = ((identity, contents[str(identity)]) for identity in ids if str(identity) in contents)
+
+        return {identity: self._parse_latest(values) for identity, values in rows}
+
     def get_timeseries_prices(self, name: str, timestep: int = "5m") -> Timeseries:
         """Provides the latest 300 points of the highest and lowest prices of the given item at specific time
 
@@ -137,11 +388,11 @@ class Client:
             raise ValueError(f"timestep must be in {VALID_TIMESTEPS}")
 
         item = self.items.get_item_by_name(name)
-        timeseries = Timeseries(item=item, timestep=VALID_TIMESTEPS[timestep])
 
         r = self._send_request(url=self._endpoints.timeseries, params={"id": item.id, "timestep": timestep})
         contents = r.json()["data"]
 
+        rows = []
         for row in contents:
             match row:
                 case {
@@ -149,68 +400,207 @@ class Client:
                     'avgHighPrice': high_price, 'highPriceVolume': high_volume,
                     'avgLowPrice': low_price, 'lowPriceVolume': low_volume
                 }:
-                    timeseries.highest.append(Price(timestamp=timestamp, price=high_price, volume=high_volume))
-                    timeseries.lowest.append(Price(timestamp=timestamp, price=low_price, volume=low_volume))
+                    rows.append((timestamp, high_price, high_volume, low_price, low_volume))
+
+        # Missing prices and volumes are returned as null which become NaN in the float columns
+        columns = np.array(rows, dtype=float).reshape(-1, 5).T
+        timestamps = columns[0].astype(np.int64)
+
+        timeseries = Timeseries(
+            item=item,
+            timestep=VALID_TIMESTEPS[timestep],
+            highest=PriceSeries.from_arrays(timestamps, columns[1], columns[2]),
+            lowest=PriceSeries.from_arrays(timestamps, columns[3], columns[4]),
+        )
+
+        if self.store is not None:
+            self.store.ingest(timeseries)
 
         return timeseries
 
-    def get_latest_timeseries_prices(self, timestep: str = "5m") -> list[Timeseries]:
+    def get_stored_timeseries(self, name: str, timestep: str = "5m", start: int = None, end: int = None) -> Timeseries:
+        """Reads the accumulated timeseries of an item from the local store
+
+        Parameters
+        ----------
+        name: str
+            Grand Exchange item name
+        timestep: str
+            Timestep parameter that must be one of: '5m', '1h', '6h'
+        start: int (default = None)
+            Earliest timestamp included, reads from the first stored point if None is selected
+        end: int (default = None)
+            Latest timestamp included, reads up to the last stored point if None is selected
+
+        Returns
+        -------
+        Timeseries
+        """
+        if self.store is None:
+            raise ValueError("the client was not created with a store")
+
+        return self.store.get_timeseries(self.items.get_item_by_name(name), timestep, start, end)
+
+    def get_timeseries_prices_batch(
+            self,
+            names: list[str],
+            timestep: str = "5m",
+            max_workers: int = None
+    ) -> tuple[dict[str, Timeseries], dict[str, Exception]]:
+        """Fetches the timeseries of many items over a bounded thread pool
+
+        Every worker shares the client's connection pool. A failure for one item is
+        reported alongside the results rather than aborting the whole batch.
+
+        Parameters
+        ----------
+        names: list[str]
+            Grand Exchange item names
+        timestep: str
+            Timestep parameter that must be one of: '5m', '1h', '6h'
+        max_workers: int (default = None)
+            Number of threads used to send requests, defaults to the connection pool size
+
+        Returns
+        -------
+        tuple[dict[str, Timeseries], dict[str, Exception]]
+            Timeseries keyed by item name, and the exception raised for each item that failed
+        """
+        if timestep not in VALID_TIMESTEPS:
+            raise ValueError(f"timestep must be in {VALID_TIMESTEPS}")
+
+        names = list(dict.fromkeys(names))
+        _ = self.items
+
+        timeseries = {}
+        failures = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers or self._pool_size) as executor:
+            futures = {name: executor.submit(self.get_timeseries_prices, name, timestep) for name in names}
+
+        for name, future in futures.items():
+            if (err := future.exception()) is not None:
+                failures[name] = err
+            else:
+                timeseries[name] = future.result()
+
+        return timeseries, failures
+
+    def get_latest_timeseries_prices(self, timestep: str = "5m", timestamp: int = None) -> list[Timeseries]:
         """Gets the timeseries prices for all items at the given timestep
 
+        Each timeseries holds a single point stamped with the start of the interval as
+        returned by the API.
+
         Parameters
         ----------
         timestep: str
             Timestep parameter must be one of: '5m', '1h', '6h'
+        timestamp: int (default = None)
+            Start of a past interval to fetch, must be a multiple of the timestep's length in
+            seconds. The latest interval is fetched if None is selected
 
         Returns
         -------
         list[Timeseries]
         """
-        if timestep not in VALID_TIMESTEPS:
-            raise ValueError(f"timestep must be in {VALID_TIMESTEPS}")
+        return list(self.get_latest_timeseries_prices_columnar(timestep, timestamp).timeseries(self.items))
 
-        timestamp = time.time()
-        ts = []
+    def get_latest_timeseries_prices_columnar(self, timestep: str = "5m", timestamp: int = None) -> IntervalSnapshot:
+        """Gets the average prices and volumes of all items at the given timestep into a columnar snapshot
 
-        r = self._send_request(url=self._endpoints.directory(timestep))
-        contents = r.json()["data"]
+        The snapshot is filled directly from the response without creating a Timeseries for
+        each item and does not need the item mapping.
 
-        for id_, row in contents.items():
-            item = self.items.get_item_by_id(int(id_))
-            if not item:
-                continue
+        Parameters
+        ----------
+        timestep: str
+            Timestep parameter must be one of: '5m', '1h', '6h'
+        timestamp: int (default = None)
+            Start of a past interval to fetch, must be a multiple of the timestep's length in
+            seconds. The latest interval is fetched if None is selected
 
-            timeseries = Timeseries(item=item, timestep=VALID_TIMESTEPS[timestep])
+        Returns
+        -------
+        IntervalSnapshot
+        """
+        if timestep not in VALID_TIMESTEPS:
+            raise ValueError(f"timestep must be in {VALID_TIMESTEPS}")
 
-            match row:
-                case {
-                    "avgHighPrice": high_price, "highPriceVolume": high_volume,
-                    "avgLowPrice": low_price, "lowPriceVolume": low_volume
-                }:
-                    timeseries.highest.append(Price(timestamp=timestamp, price=high_price, volume=high_volume))
-                    timeseries.lowest.append(Price(timestamp=timestamp, price=low_price, volume=low_volume))
+        params = None
+        if timestamp is not None:
+            if timestamp % TIMESTEP_SECONDS[timestep] != 0:
+                raise ValueError(f"timestamp must be a multiple of {TIMESTEP_SECONDS[timestep]} for '{timestep}'")
+            params = {"timestamp": timestamp}
+
+        r = self._send_request(url=self._endpoints.directory(timestep), params=params)
 
-            ts.append(timeseries)
+        match r.json():
+            case {"data": contents, "timestamp": timestamp} if timestamp is not None:
+                snapshot = IntervalSnapshot.from_interval(contents, timestamp, VALID_TIMESTEPS[timestep])
+            case _:
+                raise MalformedResponseError()
 
-        return ts
+        if self.store is not None:
+            self.store.ingest_snapshot(snapshot)
+
+        return snapshot
 
     def _mapping(self) -> list[GrandExchangeItem]:
         """Fetches the item mappings from the API and converts them into a list of Grand Exchange items
 
+        When a cache directory is configured a fresh local snapshot is used without contacting
+        the API. A stale snapshot is revalidated with a conditional request and is only
+        downloaded again if the API reports that the mapping has changed.
+
         Returns
         -------
         list[GrandExchangeItem]
         """
-        mappings = []
+        if self._mapping_cache is None:
+            r = self._send_request(url=self._endpoints.mapping)
+            return self._parse_mapping(r.json())
+
+        snapshot = self._mapping_cache.load()
+        if snapshot is not None and self._mapping_cache.is_fresh(snapshot):
+            return snapshot.to_items()
+
+        headers = snapshot.validators() if snapshot is not None else None
+        r = self._send_request(url=self._endpoints.mapping, headers=headers)
+
+        if r.status_code == 304 and snapshot is not None:
+            snapshot.fetched_at = time.time()
+            self._mapping_cache.save(snapshot)
+            return snapshot.to_items()
+
+        mappings = self._parse_mapping(r.json())
+        self._mapping_cache.save(MappingSnapshot.from_items(
+            mappings,
+            etag=r.headers.get("ETag"),
+            last_modified=r.headers.get("Last-Modified"),
+        ))
+
+        return mappings
 
-        r = self._send_request(url=self._endpoints.mapping)
-        items = r.json()
+    @staticmethod
+    def _parse_mapping(items: list[dict]) -> list[GrandExchangeItem]:
+        """Converts the raw mapping response into a list of Grand Exchange items
+
+        Parameters
+        ----------
+        items: list[dict]
+            JSON response from the mapping endpoint
+
+        Returns
+        -------
+        list[GrandExchangeItem]
+        """
+        mappings = []
+        keys = {k.alias for k in GrandExchangeItem.__fields__.values()}
 
         for item in items:
-            keys = [k.alias for k in GrandExchangeItem.__fields__.values()]
-            matching_keys = item.keys() & keys
             mappings.append(
-                GrandExchangeItem(**{k: v for k, v in item.items() if k in matching_keys})
+                GrandExchangeItem(**{k: v for k, v in item.items() if k in keys})
             )
 
         return mappings
@@ -8,20 +8,67 @@ VALID_TIMESTEPS = {
     "5m": 5, "1h": 60, "6h": 3600,
 }
 
-SAWMILL_COSTS = {
-    "Logs": 100,
-    "Oak logs": 250,
-    "Teak logs": 500,
-    "Mahogany logs": 1500,
+# Length in seconds of the interval covered by each timestep, past intervals of the /5m and /1h
+# endpoints are requested by a timestamp that is a multiple of the length
+TIMESTEP_SECONDS = {
+    "5m": 5 * 60, "1h": 60 * 60, "6h": 6 * 60 * 60,
 }
 
-PLANK_MAKE_COSTS = {
-    "Logs": 70,
-    "Oak logs": 175,
-    "Teak logs": 350,
-    "Mahogany logs": 1050,
+# Sentinel stored in integer price arrays in place of a value the API did not provide
+MISSING = -1
+
+# HTTP connection pool and retry policy
+POOL_SIZE = 10
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 30
+RETRIES = 3
+BACKOFF_FACTOR = 0.5
+MAX_BACKOFF = 60
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Concurrent requests in flight and requests started per second by the asynchronous client
+CONCURRENCY = 8
+RATE_LIMIT = 10
+
+# Number of seconds a locally cached item mapping is used before being revalidated
+MAPPING_CACHE_TTL = 24 * 60 * 60
+
+# Fees paid to process items are kept alongside the recipes that use them and are read from
+# the recipe table when first accessed, see ``grandexchange.recipes.load_fees``
+_FEES = {
+    "ZAHURS_FEE": "zahur",
+    "WESLEYS_FEE": "wesley",
+    "SAWMILL_COSTS": "sawmill",
+    "PLANK_MAKE_COSTS": "plank_make",
 }
 
+
+def __getattr__(name: str):
+    if name in _FEES:
+        from grandexchange.recipes import load_fees
+        return load_fees()[_FEES[name]]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Charged items whose names end in a dose like potions, but whose charges can not be decanted
+CHARGED_ITEMS = frozenset({
+    "Abyssal bracelet",
+    "Amulet of glory",
+    "Amulet of glory(t)",
+    "Black mask",
+    "Burning amulet",
+    "Castle wars bracelet",
+    "Combat bracelet",
+    "Digsite pendant",
+    "Games necklace",
+    "Necklace of passage",
+    "Ring of dueling",
+    "Ring of returning",
+    "Ring of wealth",
+    "Skills necklace",
+    "Slayer ring",
+    "Waterskin",
+})
+
 REPAIR_BARROWS_COSTS = {
     "helm": 60_000,
     "body": 90_000,
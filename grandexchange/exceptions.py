@@ -1,5 +1,10 @@
+from __future__ import annotations
+
 from dataclasses import dataclass, field
-from grandexchange.items import GrandExchangeItem
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from grandexchange.items import GrandExchangeItem
 
 
 @dataclass
@@ -0,0 +1,273 @@
+import math
+from collections import deque
+
+import numpy as np
+
+from grandexchange.exceptions import WindowLargerThanArrayError
+
+
+def _check_window(n: int, window: int) -> None:
+    """Raises an error if the window can not be applied to an array of length n"""
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    if window > n:
+        raise WindowLargerThanArrayError(n, window)
+
+
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """Sums of every full window computed from a cumulative sum, the first window - 1 sums are NaN"""
+    sums = np.full(len(values), np.nan)
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    sums[window - 1:] = cumulative[window:] - cumulative[:-window]
+    return sums
+
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average over a rolling window
+
+    Missing values, given as NaN, are left out of the average. A window without any
+    values averages to NaN.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        Prices ordered by time
+    window: int
+        Number of points in each window
+
+    Returns
+    -------
+    np.ndarray
+        Average of the window ending at each point, the first window - 1 points are NaN
+    """
+    values = np.asarray(values, dtype=float)
+    _check_window(len(values), window)
+
+    valid = ~np.isnan(values)
+    counts = _window_sums(valid, window)
+    sums = _window_sums(np.where(valid, values, 0.0), window)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """Population standard deviation over a rolling window
+
+    Missing values, given as NaN, are left out of the calculation.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        Prices ordered by time
+    window: int
+        Number of points in each window
+
+    Returns
+    -------
+    np.ndarray
+        Standard deviation of the window ending at each point, the first window - 1 points are NaN
+    """
+    values = np.asarray(values, dtype=float)
+    _check_window(len(values), window)
+
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return np.full(len(values), np.nan)
+
+    # Shifting by the rounded overall mean keeps the sums of integer prices small and exact so
+    # the differences between cumulative sums do not lose precision
+    shifted = np.where(valid, values - np.round(values[valid].mean()), 0.0)
+    counts = _window_sums(valid, window)
+    sums = _window_sums(shifted, window)
+    squares = _window_sums(shifted ** 2, window)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variance = np.maximum(squares / counts - (sums / counts) ** 2, 0.0)
+        return np.where(counts > 0, np.sqrt(variance), np.nan)
+
+
+def vwap(prices: np.ndarray, volumes: np.ndarray, window: int) -> np.ndarray:
+    """Volume-weighted average price over a rolling window
+
+    Points with a missing price or volume, given as NaN, are left out of the average. A
+    window without any traded volume averages to NaN.
+
+    Parameters
+    ----------
+    prices: np.ndarray
+        Prices ordered by time
+    volumes: np.ndarray
+        Volume traded at each price
+    window: int
+        Number of points in each window
+
+    Returns
+    -------
+    np.ndarray
+        Weighted average of the window ending at each point, the first window - 1 points are NaN
+    """
+    prices = np.asarray(prices, dtype=float)
+    volumes = np.asarray(volumes, dtype=float)
+    _check_window(len(prices), window)
+
+    valid = ~np.isnan(prices) & ~np.isnan(volumes)
+    traded = _window_sums(np.where(valid, volumes, 0.0), window)
+    turnover = _window_sums(np.where(valid, prices * volumes, 0.0), window)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(traded > 0, turnover / traded, np.nan)
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """Exponential moving average with a smoothing factor of 2 / (span + 1)
+
+    The average starts at the first value. Missing values, given as NaN, carry the
+    previous average forward.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        Prices ordered by time
+    span: int
+        Number of points the average is weighted over
+
+    Returns
+    -------
+    np.ndarray
+    """
+    values = np.asarray(values, dtype=float)
+    average = ExponentialAverage(span)
+    return np.fromiter((average.update(value) for value in values.tolist()), dtype=float, count=len(values))
+
+
+class ExponentialAverage:
+    """Exponential moving average that is updated one point at a time"""
+
+    def __init__(self, span: int):
+        """Initialises the average
+
+        Parameters
+        ----------
+        span: int
+            Number of points the average is weighted over
+        """
+        if span < 1:
+            raise ValueError("span must be at least 1")
+
+        self.alpha = 2 / (span + 1)
+        self.value = math.nan
+
+    def update(self, value: float | None) -> float:
+        """Adds the next point to the average
+
+        Parameters
+        ----------
+        value: float | None
+            The next price, a missing price keeps the current average
+
+        Returns
+        -------
+        float
+            The updated average
+        """
+        if value is None or math.isnan(value):
+            return self.value
+
+        if math.isnan(self.value):
+            self.value = float(value)
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+class RollingWindow:
+    """Rolling average, standard deviation and volume-weighted average updated in O(1) per point
+
+    Running sums of the points in the window are kept so adding a point only needs to
+    account for the point entering and the point leaving the window.
+    """
+
+    def __init__(self, window: int):
+        """Initialises the window
+
+        Parameters
+        ----------
+        window: int
+            Number of points in the window
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+
+        self.window = window
+        self._points = deque()
+        self._shift = None
+        self._count = 0
+        self._sum = 0.0
+        self._squares = 0.0
+        self._traded = 0.0
+        self._turnover = 0.0
+
+    def _add(self, price: float | None, volume: float | None, sign: int) -> None:
+        if price is None:
+            return
+
+        if self._shift is None:
+            self._shift = float(price)
+
+        shifted = price - self._shift
+        self._count += sign
+        self._sum += sign * shifted
+        self._squares += sign * shifted ** 2
+
+        if volume is not None:
+            self._traded += sign * volume
+            self._turnover += sign * price * volume
+
+    def update(self, price: float | None, volume: float | None = None) -> None:
+        """Adds the next point and drops the oldest point once the window is full
+
+        Parameters
+        ----------
+        price: float | None
+            The next price, a missing price still takes up a place in the window
+        volume: float | None
+            Volume traded at the price
+        """
+        if price is not None and math.isnan(price):
+            price = None
+        if volume is not None and math.isnan(volume):
+            volume = None
+
+        self._points.append((price, volume))
+        self._add(price, volume, 1)
+
+        if len(self._points) > self.window:
+            self._add(*self._points.popleft(), -1)
+
+    @property
+    def full(self) -> bool:
+        """True once the window holds the given number of points"""
+        return len(self._points) == self.window
+
+    @property
+    def sma(self) -> float:
+        """Average of the prices in the window"""
+        if self._count == 0:
+            return math.nan
+        return self._shift + self._sum / self._count
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation of the prices in the window"""
+        if self._count == 0:
+            return math.nan
+        mean = self._sum / self._count
+        return math.sqrt(max(self._squares / self._count - mean ** 2, 0.0))
+
+    @property
+    def vwap(self) -> float:
+        """Volume-weighted average of the prices in the window"""
+        if self._traded <= 0:
+            return math.nan
+        return self._turnover / self._traded
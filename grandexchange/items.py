@@ -1,10 +1,44 @@
 from dataclasses import dataclass
+from typing import Iterable, Iterator
 
-from grandexchange.constants import BARROWS
+import numpy as np
 
-from pydantic import BaseModel, Field
+from grandexchange import indicators
+from grandexchange.search import NameIndex
+from grandexchange.constants import BARROWS, CHARGED_ITEMS, MISSING
+
+from pydantic import BaseModel, Field, PrivateAttr
 from collections import defaultdict
-from fuzzywuzzy import fuzz
+
+
+def dosage(name: str) -> int:
+    """Finds the number of doses in the potion based off the name
+
+    Parses the last three characters of the potion name to determine the number of doses
+
+    Parameters
+    ----------
+    name: str
+        The name of the potion to be parsed. It must contain the ending dosage of the
+        potion otherwise an error will be raised.
+
+    Returns
+    -------
+    int:
+        The number of doses in the potion
+    """
+    match name[-3:]:
+        case "(1)":
+            dose = 1
+        case "(2)":
+            dose = 2
+        case "(3)":
+            dose = 3
+        case "(4)":
+            dose = 4
+        case _:
+            raise ValueError("The given name was not parsed as a potion")
+    return dose
 
 
 class GrandExchangeItem(BaseModel):
@@ -17,9 +51,159 @@ class GrandExchangeItem(BaseModel):
     limit: int = None
 
 
+@dataclass
+class CatalogColumns:
+    """Numeric fields of every item in the catalog as int64 arrays ordered by item ID
+
+    Fields the mapping did not provide are stored as ``MISSING``.
+    """
+    ids: np.ndarray
+    value: np.ndarray
+    high_alch: np.ndarray
+    low_alch: np.ndarray
+    limit: np.ndarray
+
+    @classmethod
+    def from_items(cls, items: Iterable["GrandExchangeItem"]) -> "CatalogColumns":
+        """Creates the columns from the items, an ID that appears twice keeps its first item
+
+        Parameters
+        ----------
+        items: Iterable[GrandExchangeItem]
+
+        Returns
+        -------
+        CatalogColumns
+        """
+        unique = sorted({item.id: item for item in reversed(list(items))}.values(), key=lambda item: item.id)
+
+        def column(key: str) -> np.ndarray:
+            return np.fromiter(
+                (MISSING if (value := getattr(item, key)) is None else value for item in unique),
+                dtype=np.int64,
+                count=len(unique),
+            )
+
+        return cls(
+            ids=column("id"),
+            value=column("value"),
+            high_alch=column("high_alch"),
+            low_alch=column("low_alch"),
+            limit=column("limit"),
+        )
+
+    def rows(self, ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Finds the row of each of the given item IDs
+
+        Parameters
+        ----------
+        ids: np.ndarray
+            Grand Exchange item unique IDs
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            Row of each ID and a boolean mask of the IDs that are in the catalog, the row of an
+            ID that is not in the catalog is meaningless
+        """
+        if len(self.ids) == 0:
+            return np.zeros(len(ids), dtype=np.intp), np.zeros(len(ids), dtype=bool)
+
+        rows = np.minimum(np.searchsorted(self.ids, ids), len(self.ids) - 1)
+        return rows, self.ids[rows] == ids
+
+
 class GrandExchangeItems(BaseModel):
+    """Collection of Grand Exchange items indexed by their unique ID and name
+
+    The indexes are built once when the collection is created and updated whenever items
+    are added, either through ``add_item`` or by appending directly to ``items``.
+    """
     items: list[GrandExchangeItem]
 
+    _by_id: dict[int, GrandExchangeItem] = PrivateAttr(default_factory=dict)
+    _by_name: dict[str, GrandExchangeItem] = PrivateAttr(default_factory=dict)
+    _indexed: int = PrivateAttr(default=0)
+    _search_index: NameIndex | None = PrivateAttr(default=None)
+    _potions: dict[str, dict[int, GrandExchangeItem]] | None = PrivateAttr(default=None)
+    _degraded: dict[int, GrandExchangeItem] | None = PrivateAttr(default=None)
+    _columns: CatalogColumns | None = PrivateAttr(default=None)
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        self._reindex()
+
+    @classmethod
+    def from_items(cls, items: list[GrandExchangeItem]) -> "GrandExchangeItems":
+        """Creates the collection from items that are already validated
+
+        Validating the collection copies every item, so the items are stored as given instead.
+
+        Parameters
+        ----------
+        items: list[GrandExchangeItem]
+
+        Returns
+        -------
+        GrandExchangeItems
+        """
+        collection = cls.construct(items=items)
+        collection._reindex()
+        return collection
+
+    def _reindex(self) -> None:
+        """Builds the ID and name lookups from the stored items
+
+        The first item with a given ID or name takes precedence to match a linear search
+        through the items.
+        """
+        self._by_id = {}
+        self._by_name = {}
+        for item in self.items:
+            self._by_id.setdefault(item.id, item)
+            self._by_name.setdefault(item.name, item)
+        self._indexed = len(self.items)
+        self._clear_derived()
+
+    def _clear_derived(self) -> None:
+        """Drops the indexes that are only built when they are first used"""
+        self._search_index = None
+        self._potions = None
+        self._degraded = None
+        self._columns = None
+
+    def _index(self) -> None:
+        """Rebuilds the lookups if items were appended to the list outside of ``add_item``"""
+        if self._indexed != len(self.items):
+            self._reindex()
+
+    def add_item(self, item: GrandExchangeItem) -> None:
+        """Adds an item to the collection and its lookups
+
+        Parameters
+        ----------
+        item: GrandExchangeItem
+            The item being added
+        """
+        self._index()
+        self.items.append(item)
+        self._by_id.setdefault(item.id, item)
+        self._by_name.setdefault(item.name, item)
+        self._indexed = len(self.items)
+        self._clear_derived()
+
+    def columns(self) -> CatalogColumns:
+        """Returns the numeric fields of every item as arrays, built once and reused until the items change
+
+        Returns
+        -------
+        CatalogColumns
+        """
+        self._index()
+        if self._columns is None:
+            self._columns = CatalogColumns.from_items(self.items)
+        return self._columns
+
     def item_names(self) -> list[str]:
         """Returns the names of all the Grand Exchange items
 
@@ -29,10 +213,12 @@ class GrandExchangeItems(BaseModel):
         """
         return [item.name for item in self.items]
 
-    def search_for(self, name: str, threshold: int = 90) -> list[GrandExchangeItem]:
+    def search_for(self, name: str, threshold: int = 90, limit: int = None) -> list[GrandExchangeItem]:
         """Performs fuzzy matching to return a list of possible matching Grand Exchange items
 
-        The name and stored item name are first converted into lower case
+        The name and stored item name are first converted into lower case. The lower case
+        names are indexed on the first search so that only the items that could reach the
+        threshold are scored.
 
         Parameters
         ----------
@@ -40,19 +226,101 @@ class GrandExchangeItems(BaseModel):
             Name of the item being searched for
         threshold: int
             Matching ratio of given name and stored item name. Default is 90
+        limit: int (default = None)
+            Maximum number of items returned, all matches are returned if None is selected
 
         Returns
         -------
         list[GrandExchangeItem]
+            Matching items ordered from the highest ratio, ties are kept in the order of the items
         """
-        matches = []
+        self._index()
+        if self._search_index is None:
+            self._search_index = NameIndex(self.item_names())
+
+        return [self.items[position] for position, _ in self._search_index.search(name, threshold, limit)]
+
+    def _build_catalog_indexes(self) -> None:
+        """Groups the potions by family and finds the degraded version of each barrows piece
 
+        Both indexes are built in a single pass over the items. Charged items such as an
+        'Amulet of glory(4)' are named like potions but are not grouped into families.
+        """
+        potions = {}
+        by_name = {}
         for item in self.items:
-            ratio = fuzz.ratio(item.name.lower(), name.lower())
-            if ratio >= threshold:
-                matches.append(item)
+            by_name.setdefault(item.name, item)
+            try:
+                dose = dosage(item.name)
+            except ValueError:
+                continue
+            family = item.name[:-3].rstrip()
+            if family not in CHARGED_ITEMS:
+                potions.setdefault(family, {}).setdefault(dose, item)
+
+        degraded = {}
+        for brother in BARROWS.values():
+            for type_, name in brother.items():
+                if type_ == "set":
+                    continue
+                if (piece := by_name.get(name)) is not None and (worn := by_name.get(name + " 0")) is not None:
+                    degraded[piece.id] = worn
+
+        self._potions = {family: dict(sorted(doses.items())) for family, doses in potions.items()}
+        self._degraded = degraded
+
+    def potion_families(self) -> dict[str, dict[int, GrandExchangeItem]]:
+        """Returns every potion family keyed by its name without the dose
+
+        Returns
+        -------
+        dict[str, dict[int, GrandExchangeItem]]
+            The potion of each available dose keyed by the number of doses
+        """
+        self._index()
+        if self._potions is None:
+            self._build_catalog_indexes()
+        return self._potions
 
-        return matches
+    def get_potion_family(self, name: str) -> dict[int, GrandExchangeItem] | None:
+        """Gets the potion of each available dose of a family
+
+        Parameters
+        ----------
+        name: str
+            Name of the family, for example 'Prayer potion', or of any of its potions
+
+        Returns
+        -------
+        dict[int, GrandExchangeItem] | None
+            The potion of each dose keyed by the number of doses, None if there is no such family
+        """
+        families = self.potion_families()
+        if name in families:
+            return families[name]
+
+        try:
+            dosage(name)
+        except ValueError:
+            return None
+        return families.get(name[:-3].rstrip())
+
+    def get_degraded_item(self, identity: int) -> GrandExchangeItem | None:
+        """Gets the fully degraded version, ending in ' 0', of a barrows piece
+
+        Parameters
+        ----------
+        identity: int
+            Grand Exchange item unique ID of the repaired piece
+
+        Returns
+        -------
+        GrandExchangeItem | None
+        """
+        self._index()
+        if self._degraded is None:
+            self._build_catalog_indexes()
+        return self._degraded.get(identity)
 
     def get_item_by_id(self, identity: int) -> GrandExchangeItem | None:
         """Gets the GrandExchangeItem from the given unique ID
@@ -66,7 +334,24 @@ class GrandExchangeItems(BaseModel):
         -------
         GrandExchangeItem
         """
-        return next(iter(item for item in self.items if item.id == identity), None)
+        self._index()
+        return self._by_id.get(identity)
+
+    def get_items_by_ids(self, identities: Iterable[int]) -> list[GrandExchangeItem | None]:
+        """Gets the GrandExchangeItem of each of the given unique IDs in a single pass
+
+        Parameters
+        ----------
+        identities: Iterable[int]
+            Grand Exchange item unique IDs
+
+        Returns
+        -------
+        list[GrandExchangeItem | None]
+            The item at the same position as each ID, None for IDs that are not in the mapping
+        """
+        self._index()
+        return list(map(self._by_id.get, identities))
 
     def get_item_by_name(self, name: str) -> GrandExchangeItem:
         """Gets the GrandExchangeItem from the given name
@@ -80,9 +365,8 @@ class GrandExchangeItems(BaseModel):
         -------
         GrandExchangeItem
         """
-        for item in self.items:
-            if item.name == name:
-                return item
+        self._index()
+        return self._by_name.get(name)
 
     def get_item_by_names(self, names: list[str]) -> list[GrandExchangeItem]:
         """Gets the GrandExchangeItem from the given names
@@ -96,16 +380,164 @@ class GrandExchangeItems(BaseModel):
         -------
         list[GrandExchangeItem]
         """
-        return [item for item in self.items if item.name in names]
+        wanted = set(names)
+        return [item for item in self.items if item.name in wanted]
 
 
 class Price(BaseModel):
     """Lowest dataclass object that contains pricing data at individual timestamps"""
-    timestamp: int
+    timestamp: int | None
     price: int | None
     volume: int | None = None
 
 
+class PriceSeries:
+    """Columnar storage of a series of Prices
+
+    Timestamps are stored in an int64 array, with missing timestamps as ``MISSING``, and
+    prices and volumes in float64 arrays with missing values as NaN. Price objects are only
+    created when the series is iterated or indexed. Appending is amortised O(1).
+    """
+    __slots__ = ("_timestamps", "_prices", "_volumes", "_size")
+
+    def __init__(self, prices: Iterable[Price] = ()):
+        """Initialises the series
+
+        Parameters
+        ----------
+        prices: Iterable[Price]
+            Prices ordered by time
+        """
+        prices = list(prices)
+        self._timestamps = np.array(
+            [MISSING if x.timestamp is None else x.timestamp for x in prices], dtype=np.int64
+        )
+        self._prices = np.array([np.nan if x.price is None else x.price for x in prices], dtype=float)
+        self._volumes = np.array([np.nan if x.volume is None else x.volume for x in prices], dtype=float)
+        self._size = len(prices)
+
+    @classmethod
+    def from_arrays(cls, timestamps: np.ndarray, prices: np.ndarray, volumes: np.ndarray = None) -> "PriceSeries":
+        """Creates the series from columns without creating any Price objects
+
+        Parameters
+        ----------
+        timestamps: np.ndarray
+            Timestamps of each point
+        prices: np.ndarray
+            Prices of each point, missing prices as NaN
+        volumes: np.ndarray
+            Volumes of each point, missing volumes as NaN. All volumes are missing if not given
+
+        Returns
+        -------
+        PriceSeries
+        """
+        series = cls()
+        series._timestamps = np.asarray(timestamps, dtype=np.int64)
+        series._prices = np.asarray(prices, dtype=float)
+        series._volumes = (
+            np.full(len(series._timestamps), np.nan) if volumes is None else np.asarray(volumes, dtype=float)
+        )
+        series._size = len(series._timestamps)
+        return series
+
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value) -> "PriceSeries":
+        """Allows a PriceSeries, or a list of Prices or their dictionaries, to be given to a model field"""
+        if isinstance(value, cls):
+            return value
+        return cls(x if isinstance(x, Price) else Price.parse_obj(x) for x in value)
+
+    @classmethod
+    def __modify_schema__(cls, field_schema: dict) -> None:
+        """Describes the series as an array of Prices in a model's JSON schema"""
+        field_schema.update(type="array", items=Price.schema())
+
+    def to_list(self) -> list[dict]:
+        """Converts the series into a list of Price dictionaries
+
+        Returns
+        -------
+        list[dict]
+        """
+        return [price.dict() for price in self]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Timestamp of each point"""
+        return self._timestamps[:self._size]
+
+    @property
+    def prices(self) -> np.ndarray:
+        """Price of each point, missing prices are NaN"""
+        return self._prices[:self._size]
+
+    @property
+    def volumes(self) -> np.ndarray:
+        """Volume of each point, missing volumes are NaN"""
+        return self._volumes[:self._size]
+
+    def append(self, price: Price) -> None:
+        """Adds a price to the end of the series
+
+        Parameters
+        ----------
+        price: Price
+        """
+        if self._size == len(self._timestamps):
+            capacity = max(2 * self._size, 8)
+            self._timestamps = np.resize(self._timestamps, capacity)
+            self._prices = np.resize(self._prices, capacity)
+            self._volumes = np.resize(self._volumes, capacity)
+
+        self._timestamps[self._size] = MISSING if price.timestamp is None else price.timestamp
+        self._prices[self._size] = np.nan if price.price is None else price.price
+        self._volumes[self._size] = np.nan if price.volume is None else price.volume
+        self._size += 1
+
+    def _price(self, index: int) -> Price:
+        timestamp = self._timestamps[index]
+        price = self._prices[index]
+        volume = self._volumes[index]
+        return Price.construct(
+            timestamp=None if timestamp == MISSING else int(timestamp),
+            price=None if np.isnan(price) else int(price),
+            volume=None if np.isnan(volume) else int(volume),
+        )
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Price]:
+        return (self._price(index) for index in range(self._size))
+
+    def __getitem__(self, index: int | slice) -> "Price | PriceSeries":
+        if isinstance(index, slice):
+            return PriceSeries.from_arrays(self.timestamps[index], self.prices[index], self.volumes[index])
+        return self._price(range(self._size)[index])
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PriceSeries):
+            try:
+                other = PriceSeries.validate(other)
+            except (TypeError, ValueError):
+                return NotImplemented
+
+        return (
+            np.array_equal(self.timestamps, other.timestamps)
+            and np.array_equal(self.prices, other.prices, equal_nan=True)
+            and np.array_equal(self.volumes, other.volumes, equal_nan=True)
+        )
+
+    def __repr__(self) -> str:
+        return f"PriceSeries({list(self)!r})"
+
+
 class Offer(BaseModel):
     """Utilises the Price dataclass to provide additional detail on the Item"""
     item: GrandExchangeItem
@@ -115,20 +547,126 @@ class Offer(BaseModel):
 
 
 class Timeseries(BaseModel):
-    """Timeseries of Price dataclasses for an Item"""
+    """Timeseries of Price dataclasses for an Item
+
+    Both sides are stored as columnar PriceSeries, a list of Prices is converted when the
+    timeseries is created.
+    """
     item: GrandExchangeItem
-    highest: list[Price] = Field(default_factory=list)
-    lowest: list[Price] = Field(default_factory=list)
+    highest: PriceSeries = Field(default_factory=PriceSeries)
+    lowest: PriceSeries = Field(default_factory=PriceSeries)
     timestep: int = None
 
+    class Config:
+        json_encoders = {PriceSeries: PriceSeries.to_list}
+
+    def dict(self, **kwargs) -> dict:
+        """Converts the timeseries into a dictionary with each side as a list of Price dictionaries"""
+        contents = super().dict(**kwargs)
+        for side in ("highest", "lowest"):
+            if isinstance(contents.get(side), PriceSeries):
+                contents[side] = contents[side].to_list()
+        return contents
+
     @property
     def time_range(self) -> tuple[int, int]:
-        timestamps = [x.timestamp for x in self.highest]
-        return min(timestamps), max(timestamps)
+        timestamps = self.highest.timestamps
+        return int(timestamps.min()), int(timestamps.max())
 
     @property
     def total_volume(self) -> int:
-        return sum(x.volume for x in self.highest)
+        return int(np.nansum(self.highest.volumes))
+
+    def _side(self, side: str) -> PriceSeries:
+        if side not in ("highest", "lowest"):
+            raise ValueError("side must be either 'highest' or 'lowest'")
+        return getattr(self, side)
+
+    def prices(self, side: str = "highest") -> np.ndarray:
+        """Returns the prices of one side of the timeseries with missing prices as NaN
+
+        Parameters
+        ----------
+        side: str
+            Either 'highest' or 'lowest'
+
+        Returns
+        -------
+        np.ndarray
+        """
+        return self._side(side).prices
+
+    def volumes(self, side: str = "highest") -> np.ndarray:
+        """Returns the volumes of one side of the timeseries with missing volumes as NaN
+
+        Parameters
+        ----------
+        side: str
+            Either 'highest' or 'lowest'
+
+        Returns
+        -------
+        np.ndarray
+        """
+        return self._side(side).volumes
+
+    def sma(self, window: int, side: str = "highest") -> np.ndarray:
+        """Simple moving average of the prices, see ``indicators.sma``"""
+        return indicators.sma(self.prices(side), window)
+
+    def ema(self, span: int, side: str = "highest") -> np.ndarray:
+        """Exponential moving average of the prices, see ``indicators.ema``"""
+        return indicators.ema(self.prices(side), span)
+
+    def rolling_std(self, window: int, side: str = "highest") -> np.ndarray:
+        """Rolling standard deviation of the prices, see ``indicators.rolling_std``"""
+        return indicators.rolling_std(self.prices(side), window)
+
+    def vwap(self, window: int, side: str = "highest") -> np.ndarray:
+        """Rolling volume-weighted average price, see ``indicators.vwap``"""
+        return indicators.vwap(self.prices(side), self.volumes(side), window)
+
+    def rolling_window(self, window: int, side: str = "highest") -> indicators.RollingWindow:
+        """Creates a rolling window holding the latest points of the timeseries
+
+        Call ``update`` on the window with each new price appended to the timeseries to keep
+        its average, standard deviation and volume-weighted average current in O(1).
+
+        Parameters
+        ----------
+        window: int
+            Number of points in the window
+        side: str
+            Either 'highest' or 'lowest'
+
+        Returns
+        -------
+        indicators.RollingWindow
+        """
+        series = self._side(side)
+        rolling = indicators.RollingWindow(window)
+        for price, volume in zip(series.prices[-window:].tolist(), series.volumes[-window:].tolist()):
+            rolling.update(price, volume)
+        return rolling
+
+    def exponential_average(self, span: int, side: str = "highest") -> indicators.ExponentialAverage:
+        """Creates an exponential moving average of the timeseries that can be updated with new prices
+
+        Parameters
+        ----------
+        span: int
+            Number of points the average is weighted over
+        side: str
+            Either 'highest' or 'lowest'
+
+        Returns
+        -------
+        indicators.ExponentialAverage
+        """
+        average = indicators.ExponentialAverage(span)
+        for price in self._side(side).prices.tolist():
+            average.update(price)
+        return average
 
     def as_offers(self) -> list[Offer]:
         return [Offer(item=self.item, highest=high, lowest=low) for high, low in zip(self.highest, self.lowest)]
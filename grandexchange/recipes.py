@@ -0,0 +1,357 @@
+import functools
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import yaml
+from pydantic import BaseModel
+
+from grandexchange.constants import MISSING
+from grandexchange.items import GrandExchangeItems
+from grandexchange.snapshot import PriceSnapshot
+from grandexchange.transactions import calculate_tax_batch
+
+RECIPES_PATH = Path(__file__).parent / "static" / "recipes.yaml"
+GODSWORDS_PATH = Path(__file__).parent / "static" / "godswords.yaml"
+
+
+class Recipe(BaseModel):
+    """Items consumed and produced by a single craft"""
+    name: str
+    inputs: dict[str, int]
+    output: str
+    quantity: int = 1
+    fee: int = 0
+
+
+def load_recipes(path: str | os.PathLike = RECIPES_PATH) -> list[Recipe]:
+    """Reads a table of recipes from a YAML file
+
+    Parameters
+    ----------
+    path: str | os.PathLike
+        YAML file with a list of recipes under the ``recipes`` key, defaults to the recipes
+        shipped with the package
+
+    Returns
+    -------
+    list[Recipe]
+    """
+    with open(path, encoding="utf-8") as f:
+        contents = yaml.safe_load(f)
+
+    return [Recipe.parse_obj(recipe) for recipe in contents["recipes"]]
+
+
+def load_godsword_recipes(path: str | os.PathLike = GODSWORDS_PATH) -> list[Recipe]:
+    """Creates the recipes of the godsword blade and of attaching each hilt to it
+
+    Parameters
+    ----------
+    path: str | os.PathLike
+        YAML file with the ``blade``, its ``pieces`` and the ``hilt`` and ``sword`` of each
+        godsword under ``types``, defaults to the godswords shipped with the package
+
+    Returns
+    -------
+    list[Recipe]
+    """
+    with open(path, encoding="utf-8") as f:
+        contents = yaml.safe_load(f)
+
+    blade = contents["blade"]
+    recipes = [Recipe(name=blade, inputs=dict.fromkeys(contents["pieces"], 1), output=blade)]
+    for godsword in contents["types"].values():
+        recipes.append(Recipe(name=godsword["sword"], inputs={blade: 1, godsword["hilt"]: 1}, output=godsword["sword"]))
+
+    return recipes
+
+
+@functools.lru_cache
+def load_fees(path: str | os.PathLike = RECIPES_PATH) -> dict:
+    """Reads the processing fees shared by the recipes and the calculators
+
+    The file is only read once for each path.
+
+    Parameters
+    ----------
+    path: str | os.PathLike
+        YAML file with the fees under the ``fees`` key, defaults to the recipes shipped with
+        the package
+
+    Returns
+    -------
+    dict
+        Fee of each NPC, or the fee of each log for the sawmill and Plank Make
+    """
+    with open(path, encoding="utf-8") as f:
+        contents = yaml.safe_load(f)
+
+    return contents["fees"]
+
+
+def _rows(snapshot: PriceSnapshot, ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Finds the snapshot row of each item ID and whether the item is in the snapshot
+
+    The snapshot must have at least one row.
+    """
+    order = np.argsort(snapshot.ids, kind="stable")
+    positions = np.searchsorted(snapshot.ids, ids, sorter=order)
+    rows = order[np.minimum(positions, len(order) - 1)]
+    return rows, snapshot.ids[rows] == ids
+
+
+@dataclass
+class RecipeTable:
+    """Profit of a single craft of many recipes, ranked by profit"""
+    names: np.ndarray
+    output_ids: np.ndarray
+    cost: np.ndarray
+    revenue: np.ndarray
+    tax: np.ndarray
+    profit: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+@dataclass
+class ChainTable:
+    """Best production chain starting from each item, ranked by profit per starting item"""
+    start_ids: np.ndarray
+    end_ids: np.ndarray
+    steps: list[tuple[str, ...]]
+    profit: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.start_ids)
+
+
+class RecipeBook:
+    """Recipes compiled to arrays of item IDs so they can all be priced against a snapshot at once
+
+    The inputs of every recipe are flattened into one array of item IDs alongside the
+    recipe each input belongs to. Costs are then summed per recipe with a single
+    ``np.bincount`` instead of a loop over the recipes.
+    """
+
+    def __init__(self, recipes: list[Recipe], items: GrandExchangeItems):
+        """Compiles the recipes
+
+        Recipes that use or make an item that is not in the item mapping can not be priced
+        and are kept in ``unresolved`` instead.
+
+        Parameters
+        ----------
+        recipes: list[Recipe]
+            Recipes being compiled
+        items: GrandExchangeItems
+            Item mapping used to find the ID of each item name
+        """
+        self.recipes: list[Recipe] = []
+        self.unresolved: list[Recipe] = []
+
+        input_recipe = []
+        input_ids = []
+        input_quantity = []
+        output_ids = []
+
+        for recipe in recipes:
+            output = items.get_item_by_name(recipe.output)
+            inputs = [items.get_item_by_name(name) for name in recipe.inputs]
+            if output is None or None in inputs:
+                self.unresolved.append(recipe)
+                continue
+
+            position = len(self.recipes)
+            self.recipes.append(recipe)
+            output_ids.append(output.id)
+            for item, quantity in zip(inputs, recipe.inputs.values()):
+                input_recipe.append(position)
+                input_ids.append(item.id)
+                input_quantity.append(quantity)
+
+        self.names = np.array([recipe.name for recipe in self.recipes], dtype=object)
+        self.output_ids = np.array(output_ids, dtype=np.int64)
+        self.output_quantity = np.array([recipe.quantity for recipe in self.recipes], dtype=np.int64)
+        self.fees = np.array([recipe.fee for recipe in self.recipes], dtype=np.int64)
+        self.input_recipe = np.array(input_recipe, dtype=np.intp)
+        self.input_ids = np.array(input_ids, dtype=np.int64)
+        self.input_quantity = np.array(input_quantity, dtype=np.int64)
+
+    @classmethod
+    def load(cls, items: GrandExchangeItems, path: str | os.PathLike = None) -> "RecipeBook":
+        """Reads and compiles a table of recipes from a YAML file
+
+        Parameters
+        ----------
+        items: GrandExchangeItems
+            Item mapping used to find the ID of each item name
+        path: str | os.PathLike (default = None)
+            YAML file of recipes, the recipes and godswords shipped with the package are used
+            if None is selected
+
+        Returns
+        -------
+        RecipeBook
+        """
+        if path is None:
+            return cls(load_recipes() + load_godsword_recipes(), items)
+        return cls(load_recipes(path), items)
+
+    def __len__(self) -> int:
+        return len(self.recipes)
+
+    def evaluate(self, snapshot: PriceSnapshot, volume: int = 1, top_n: int = None) -> RecipeTable:
+        """Calculates the profit of every recipe against the latest prices
+
+        Inputs are bought at their lowest price + 1 and the output is sold at its highest
+        price - 1 after tax. Recipes with an input or output that has no price in the
+        snapshot are skipped.
+
+        Parameters
+        ----------
+        snapshot: PriceSnapshot
+            Latest prices of the items
+        volume: int
+            Number of times each recipe is crafted
+        top_n: int (default = None)
+            Number of recipes returned, all priced recipes are returned if None is selected
+
+        Returns
+        -------
+        RecipeTable
+            Recipes ordered by descending profit, ties keep the order of the recipes
+        """
+        n = len(self.recipes)
+        if len(snapshot) == 0:
+            # A single unpriced row keeps the lookups below valid and leaves every recipe unpriced
+            snapshot = PriceSnapshot.from_latest({"-1": {}})
+
+        rows, found = _rows(snapshot, self.input_ids)
+        buy = snapshot.low[rows]
+        missing = ~found | (buy == MISSING)
+        unpriced = np.bincount(self.input_recipe, weights=missing, minlength=n) > 0
+        cost = np.bincount(self.input_recipe, weights=self.input_quantity * (buy + 1), minlength=n)
+
+        rows, found = _rows(snapshot, self.output_ids)
+        sell = snapshot.high[rows] - 1
+        unpriced |= ~found | (snapshot.high[rows] == MISSING)
+
+        sold = self.output_quantity * volume
+        cost = (cost + self.fees) * volume
+        revenue = sell * sold
+        tax = np.round(calculate_tax_batch(sell, sold), 0)
+        profit = revenue - cost - tax
+
+        priced = np.flatnonzero(~unpriced)
+        order = priced[np.lexsort((priced, -profit[priced]))][:top_n]
+        return RecipeTable(
+            names=self.names[order],
+            output_ids=self.output_ids[order],
+            cost=cost[order],
+            revenue=revenue[order],
+            tax=tax[order],
+            profit=profit[order],
+        )
+
+    def best_chains(self, snapshot: PriceSnapshot, max_steps: int = 4, top_n: int = None) -> ChainTable:
+        """Finds the most profitable chain of recipes starting from each item
+
+        Items are nodes and every input of a recipe is an edge to the recipe's output. The
+        value of holding an item is the larger of selling it after tax at its highest price
+        - 1, or using it in a recipe, buying the other inputs at their lowest price + 1,
+        paying the fee and holding the products. The values are found by dynamic
+        programming over the number of steps, where each step evaluates every edge at once
+        from the values of the previous step, so cycles in the graph are only followed up
+        to ``max_steps`` times.
+
+        Parameters
+        ----------
+        snapshot: PriceSnapshot
+            Latest prices of the items
+        max_steps: int
+            Maximum number of recipes in a chain
+        top_n: int (default = None)
+            Number of chains returned, every item with a chain is returned if None is selected
+
+        Returns
+        -------
+        ChainTable
+            Chains with at least one recipe, ordered by descending profit of buying one
+            starting item at its lowest price + 1, ties keep the order of the item IDs
+        """
+        if len(snapshot) == 0:
+            # A single unpriced row keeps the lookups below valid and leaves every item unpriced
+            snapshot = PriceSnapshot.from_latest({"-1": {}})
+
+        nodes, inverse = np.unique(np.concatenate((self.input_ids, self.output_ids)), return_inverse=True)
+        input_node = inverse[:len(self.input_ids)]
+        output_node = inverse[len(self.input_ids):]
+
+        rows, found = _rows(snapshot, nodes)
+        buyable = found & (snapshot.low[rows] != MISSING)
+        sellable = found & (snapshot.high[rows] != MISSING)
+        buy = np.where(buyable, snapshot.low[rows] + 1, 0)
+        sell = snapshot.high[rows] - 1
+        value = np.where(sellable, sell - np.round(calculate_tax_batch(sell, 1), 0), -np.inf)
+
+        # Cost of the other inputs of each edge's recipe, an edge can only be used if they all have a price
+        n = len(self.recipes)
+        edge_buy = buy[input_node] * self.input_quantity
+        edge_unpriced = ~buyable[input_node]
+        cost = np.bincount(self.input_recipe, weights=edge_buy, minlength=n)
+        unpriced = np.bincount(self.input_recipe, weights=edge_unpriced, minlength=n)
+        other_cost = cost[self.input_recipe] - edge_buy
+        usable = unpriced[self.input_recipe] - edge_unpriced == 0
+
+        made = self.output_quantity[self.input_recipe]
+        fees = self.fees[self.input_recipe]
+        edge_output = output_node[self.input_recipe]
+
+        # Edge taken from each node at each step, -1 where the item is sold
+        choices = []
+        choice = np.full(len(nodes), -1)
+        for _ in range(max_steps):
+            with np.errstate(invalid="ignore"):
+                candidate = np.where(usable, (made * value[edge_output] - fees - other_cost) / self.input_quantity, -np.inf)
+            best = np.full(len(nodes), -np.inf)
+            np.maximum.at(best, input_node, candidate)
+
+            improved = best > value
+            if not improved.any():
+                break
+
+            # The first edge reaching the best value of each improved node
+            edges = np.flatnonzero(improved[input_node] & (candidate == best[input_node]))
+            improved_nodes, first = np.unique(input_node[edges], return_index=True)
+            choice = choice.copy()
+            choice[improved_nodes] = edges[first]
+            choices.append(choice)
+            value = np.where(improved, best, value)
+
+        starts = np.flatnonzero(buyable & (choice >= 0))
+        profit = value[starts] - buy[starts]
+        starts = starts[np.lexsort((starts, -profit))][:top_n]
+
+        end_ids = []
+        steps = []
+        for start in starts.tolist():
+            node = start
+            path = []
+            # The value at each step was reached from the values of the step before it
+            for step in reversed(choices):
+                if (edge := step[node]) < 0:
+                    break
+                path.append(self.recipes[self.input_recipe[edge]].name)
+                node = edge_output[edge]
+            end_ids.append(nodes[node])
+            steps.append(tuple(path))
+
+        return ChainTable(
+            start_ids=nodes[starts],
+            end_ids=np.array(end_ids, dtype=np.int64),
+            steps=steps,
+            profit=value[starts] - buy[starts],
+        )
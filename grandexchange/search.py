@@ -0,0 +1,101 @@
+from collections import Counter
+
+import numpy as np
+from fuzzywuzzy import fuzz
+
+
+class NameIndex:
+    """Prebuilt index of item names for fuzzy matching with ``fuzz.ratio``
+
+    The ratio is 2 * M / T where M is the number of matching characters and T is the
+    combined length of both names. M can never exceed the number of characters the names
+    have in common, counted with multiplicity, nor the length of the shorter name, so both
+    give an upper bound on the ratio. Names whose bound falls below the threshold can not
+    match and are pruned before any ratio is calculated.
+    """
+
+    def __init__(self, names: list[str]):
+        """Builds the index
+
+        Parameters
+        ----------
+        names: list[str]
+            Names being searched, positions in the list are returned by ``search``
+        """
+        self.names = [name.lower() for name in names]
+        self.lengths = np.fromiter(map(len, self.names), dtype=np.int64, count=len(self.names))
+
+        alphabet = sorted(set().union(*self.names))
+        self._columns = {char: column for column, char in enumerate(alphabet)}
+
+        # Number of times each character occurs in each name
+        self._counts = np.zeros((len(self.names), len(alphabet)), dtype=np.int16)
+        rows = np.repeat(np.arange(len(self.names)), self.lengths)
+        columns = np.fromiter(
+            (self._columns[char] for name in self.names for char in name), dtype=np.intp, count=len(rows)
+        )
+        np.add.at(self._counts, (rows, columns), 1)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @staticmethod
+    def _bound(shared: np.ndarray, total: np.ndarray) -> np.ndarray:
+        """Highest ratio that can be scored, rounded in the same way as ``fuzz.ratio``"""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(total > 0, np.round(100 * (2.0 * shared / total)), 100)
+
+    def candidates(self, query: str, threshold: float) -> np.ndarray:
+        """Returns the positions of the names that could score at least the threshold
+
+        Parameters
+        ----------
+        query: str
+            Lower case name being searched for
+        threshold: float
+            Minimum ratio of a match
+
+        Returns
+        -------
+        np.ndarray
+        """
+        total = self.lengths + len(query)
+        positions = np.flatnonzero(self._bound(np.minimum(self.lengths, len(query)), total) >= threshold)
+
+        counts = Counter(query)
+        known = [(self._columns[char], count) for char, count in counts.items() if char in self._columns]
+        if known:
+            columns, wanted = zip(*known)
+            shared = np.minimum(self._counts[np.ix_(positions, columns)], wanted).sum(axis=1)
+        else:
+            shared = np.zeros(len(positions), dtype=np.int64)
+
+        return positions[self._bound(shared, total[positions]) >= threshold]
+
+    def search(self, name: str, threshold: float = 90, limit: int = None) -> list[tuple[int, int]]:
+        """Finds the names that match the given name ranked by their ratio
+
+        Parameters
+        ----------
+        name: str
+            Name being searched for, it is compared in lower case
+        threshold: float
+            Minimum ratio of a match
+        limit: int (default = None)
+            Maximum number of matches returned, all matches are returned if None is selected
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            Position and ratio of each match, ties are kept in the order of the names
+        """
+        query = name.lower()
+
+        matches = []
+        for position in self.candidates(query, threshold).tolist():
+            ratio = fuzz.ratio(self.names[position], query)
+            if ratio >= threshold:
+                matches.append((position, ratio))
+
+        matches.sort(key=lambda match: -match[1])
+        return matches[:limit]
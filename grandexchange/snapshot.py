@@ -0,0 +1,317 @@
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Iterator
+
+import numpy as np
+
+from grandexchange.constants import MISSING
+from grandexchange.items import GrandExchangeItems, Offer, Price, PriceSeries, Timeseries
+
+
+def _price(timestamp: int, price: int) -> Price:
+    """Materialises a Price from a row of the snapshot, restoring missing values as None"""
+    return Price(
+        timestamp=None if timestamp == MISSING else int(timestamp),
+        price=None if price == MISSING else int(price),
+    )
+
+
+@dataclass
+class PriceSnapshot:
+    """Columnar snapshot of the latest highest and lowest prices
+
+    Every column is an int64 array where the same row refers to the same item. Prices and
+    timestamps that were not provided by the API are stored as ``MISSING``. Offers are
+    only created when they are requested.
+    """
+    ids: np.ndarray
+    high: np.ndarray
+    high_time: np.ndarray
+    low: np.ndarray
+    low_time: np.ndarray
+
+    @classmethod
+    def from_latest(cls, contents: dict[str, dict]) -> "PriceSnapshot":
+        """Creates the snapshot from the data of the /latest endpoint
+
+        Parameters
+        ----------
+        contents: dict[str, dict]
+            Price data keyed by the item ID as returned by the API
+
+        Returns
+        -------
+        PriceSnapshot
+        """
+        n = len(contents)
+        rows = contents.values()
+
+        def column(key: str) -> np.ndarray:
+            return np.fromiter(
+                (MISSING if (value := row.get(key)) is None else value for row in rows),
+                dtype=np.int64,
+                count=n,
+            )
+
+        return cls(
+            ids=np.fromiter(map(int, contents), dtype=np.int64, count=n),
+            high=column("high"),
+            high_time=column("highTime"),
+            low=column("low"),
+            low_time=column("lowTime"),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @cached_property
+    def index(self) -> dict[int, int]:
+        """Row of each item in the snapshot keyed by the item ID"""
+        return dict(zip(self.ids.tolist(), range(len(self.ids))))
+
+    @property
+    def priced(self) -> np.ndarray:
+        """Boolean mask of the rows that have both a highest and lowest price"""
+        return (self.high != MISSING) & (self.low != MISSING)
+
+    def row(self, identity: int) -> int | None:
+        """Returns the row of the item in the snapshot
+
+        Parameters
+        ----------
+        identity: int
+            Grand Exchange item unique ID
+
+        Returns
+        -------
+        int | None
+        """
+        return self.index.get(identity)
+
+    def take(self, rows: np.ndarray) -> "PriceSnapshot":
+        """Creates a snapshot of only the selected rows
+
+        Parameters
+        ----------
+        rows: np.ndarray
+            Row positions or a boolean mask of the rows to keep
+
+        Returns
+        -------
+        PriceSnapshot
+        """
+        return PriceSnapshot(
+            ids=self.ids[rows],
+            high=self.high[rows],
+            high_time=self.high_time[rows],
+            low=self.low[rows],
+            low_time=self.low_time[rows],
+        )
+
+    def select(self, ids: list[int]) -> "PriceSnapshot":
+        """Creates a snapshot of the given items, IDs that are not in the snapshot are ignored
+
+        Parameters
+        ----------
+        ids: list[int]
+            Grand Exchange item unique IDs
+
+        Returns
+        -------
+        PriceSnapshot
+        """
+        rows = [row for identity in ids if (row := self.index.get(identity)) is not None]
+        return self.take(np.array(rows, dtype=np.intp))
+
+    def changed_since(self, previous: "PriceSnapshot") -> "PriceSnapshot":
+        """Creates a snapshot of the rows that are new or differ from a previous snapshot
+
+        A row has changed if any of its highest or lowest price or timestamp differ.
+
+        Parameters
+        ----------
+        previous: PriceSnapshot
+            The snapshot being compared against
+
+        Returns
+        -------
+        PriceSnapshot
+        """
+        if len(previous) == 0:
+            return self.take(slice(None))
+
+        order = np.argsort(previous.ids, kind="stable")
+        positions = np.searchsorted(previous.ids, self.ids, sorter=order)
+        rows = order[np.minimum(positions, len(order) - 1)]
+        found = previous.ids[rows] == self.ids
+
+        changed = ~found
+        for column in ("high", "high_time", "low", "low_time"):
+            changed |= getattr(self, column) != getattr(previous, column)[rows]
+
+        return self.take(changed)
+
+    def prices(self, identity: int) -> tuple[Price, Price] | None:
+        """Returns the highest and lowest price of the item
+
+        Parameters
+        ----------
+        identity: int
+            Grand Exchange item unique ID
+
+        Returns
+        -------
+        tuple[Price, Price] | None
+            None is returned if the item is not in the snapshot
+        """
+        if (row := self.index.get(identity)) is None:
+            return None
+
+        return (
+            _price(self.high_time[row], self.high[row]),
+            _price(self.low_time[row], self.low[row]),
+        )
+
+    def to_offer(self, identity: int, items: GrandExchangeItems) -> Offer | None:
+        """Creates the offer of a single item
+
+        Parameters
+        ----------
+        identity: int
+            Grand Exchange item unique ID
+        items: GrandExchangeItems
+            Item mapping used to find the item's details
+
+        Returns
+        -------
+        Offer | None
+            None is returned if the item is not in the snapshot or the item mapping
+        """
+        item = items.get_item_by_id(identity)
+        prices = self.prices(identity)
+        if item is None or prices is None:
+            return None
+
+        highest, lowest = prices
+        return Offer(item=item, highest=highest, lowest=lowest)
+
+    def offers(self, items: GrandExchangeItems) -> Iterator[Offer]:
+        """Lazily creates an offer for every row of an item in the item mapping
+
+        Parameters
+        ----------
+        items: GrandExchangeItems
+            Item mapping used to find the items' details
+
+        Yields
+        ------
+        Offer
+        """
+        for row, identity in enumerate(self.ids.tolist()):
+            if (item := items.get_item_by_id(identity)) is None:
+                continue
+
+            yield Offer(
+                item=item,
+                highest=_price(self.high_time[row], self.high[row]),
+                lowest=_price(self.low_time[row], self.low[row]),
+            )
+
+
+@dataclass
+class LatestDelta:
+    """Entries of the latest prices that changed since the previous poll"""
+    changes: PriceSnapshot
+    snapshot: PriceSnapshot
+    polled_at: float
+
+    @property
+    def changed(self) -> int:
+        """Number of items whose price or timestamp changed"""
+        return len(self.changes)
+
+
+@dataclass
+class IntervalSnapshot:
+    """Columnar snapshot of the average prices and volumes of every item over one interval
+
+    Created from the /5m and /1h endpoints where every row shares the server's timestamp
+    for the start of the interval. Prices and volumes are float64 arrays with the values
+    that were not provided by the API as NaN, matching the columns of a Timeseries.
+    """
+    timestamp: int
+    timestep: int
+    ids: np.ndarray
+    avg_high: np.ndarray
+    high_volume: np.ndarray
+    avg_low: np.ndarray
+    low_volume: np.ndarray
+
+    @classmethod
+    def from_interval(cls, contents: dict[str, dict], timestamp: int, timestep: int) -> "IntervalSnapshot":
+        """Creates the snapshot from the data of the /5m or /1h endpoint
+
+        Parameters
+        ----------
+        contents: dict[str, dict]
+            Average prices and volumes keyed by the item ID as returned by the API
+        timestamp: int
+            Start of the interval as returned by the API
+        timestep: int
+            Timestep of the interval, one of the values of ``VALID_TIMESTEPS``
+
+        Returns
+        -------
+        IntervalSnapshot
+        """
+        n = len(contents)
+        rows = contents.values()
+
+        def column(key: str) -> np.ndarray:
+            return np.fromiter(
+                (np.nan if (value := row.get(key)) is None else value for row in rows),
+                dtype=float,
+                count=n,
+            )
+
+        return cls(
+            timestamp=int(timestamp),
+            timestep=timestep,
+            ids=np.fromiter(map(int, contents), dtype=np.int64, count=n),
+            avg_high=column("avgHighPrice"),
+            high_volume=column("highPriceVolume"),
+            avg_low=column("avgLowPrice"),
+            low_volume=column("lowPriceVolume"),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def timeseries(self, items: GrandExchangeItems) -> Iterator[Timeseries]:
+        """Lazily creates a single point timeseries for every row of an item in the item mapping
+
+        The rows were already parsed into arrays so each timeseries is constructed without
+        being validated again.
+
+        Parameters
+        ----------
+        items: GrandExchangeItems
+            Item mapping used to find the items' details
+
+        Yields
+        ------
+        Timeseries
+        """
+        timestamps = np.array([self.timestamp], dtype=np.int64)
+        found = items.get_items_by_ids(self.ids.tolist())
+
+        for row, item in enumerate(found):
+            if item is None:
+                continue
+
+            yield Timeseries.construct(
+                item=item,
+                timestep=self.timestep,
+                highest=PriceSeries.from_arrays(timestamps, self.avg_high[row:row + 1], self.high_volume[row:row + 1]),
+                lowest=PriceSeries.from_arrays(timestamps, self.avg_low[row:row + 1], self.low_volume[row:row + 1]),
+            )
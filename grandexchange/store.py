@@ -0,0 +1,455 @@
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from itertools import repeat
+from typing import Iterable
+
+import numpy as np
+
+from grandexchange.constants import VALID_TIMESTEPS
+from grandexchange.items import GrandExchangeItem, PriceSeries, Timeseries
+from grandexchange.snapshot import IntervalSnapshot
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    timestep INTEGER NOT NULL,
+    item_id INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    avg_high INTEGER,
+    high_volume INTEGER,
+    avg_low INTEGER,
+    low_volume INTEGER,
+    PRIMARY KEY (timestep, timestamp, item_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS bars_by_item ON bars (timestep, item_id, timestamp);
+CREATE TABLE IF NOT EXISTS intervals (
+    timestep INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    PRIMARY KEY (timestep, timestamp)
+) WITHOUT ROWID;
+"""
+
+_INSERT = "INSERT OR IGNORE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?)"
+_INSERT_INTERVAL = "INSERT OR IGNORE INTO intervals VALUES (?, ?)"
+
+# Number of rows converted into arrays at a time when reading bars
+_CHUNK = 65_536
+
+
+def _timestep(timestep: str) -> int:
+    if timestep not in VALID_TIMESTEPS:
+        raise ValueError(f"timestep must be in {VALID_TIMESTEPS}")
+    return VALID_TIMESTEPS[timestep]
+
+
+def _column(values: np.ndarray) -> list[int | None]:
+    """Converts a float price column into integers with NaN values as NULL"""
+    missing = np.isnan(values)
+    column = np.where(missing, 0, values).astype(np.int64).astype(object)
+    column[missing] = None
+    return column.tolist()
+
+
+@dataclass
+class StoredBars:
+    """Columns of the bars read from the store for many items
+
+    Rows are ordered by item ID and then by timestamp. Missing prices and volumes are NaN.
+    """
+    item_ids: np.ndarray
+    timestamps: np.ndarray
+    avg_high: np.ndarray
+    high_volume: np.ndarray
+    avg_low: np.ndarray
+    low_volume: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows: list[tuple]) -> "StoredBars":
+        """Creates the columns from rows of (item_id, timestamp, avg_high, high_volume, avg_low, low_volume)
+
+        Parameters
+        ----------
+        rows: list[tuple]
+
+        Returns
+        -------
+        StoredBars
+        """
+        return cls.from_columns(np.array(rows, dtype=float).reshape(-1, 6).T)
+
+    @classmethod
+    def from_columns(cls, columns: np.ndarray) -> "StoredBars":
+        """Creates the columns from a float array with one row per column of ``from_rows``
+
+        Parameters
+        ----------
+        columns: np.ndarray
+
+        Returns
+        -------
+        StoredBars
+        """
+        return cls(
+            item_ids=columns[0].astype(np.int64),
+            timestamps=columns[1].astype(np.int64),
+            avg_high=columns[2],
+            high_volume=columns[3],
+            avg_low=columns[4],
+            low_volume=columns[5],
+        )
+
+    @classmethod
+    def from_snapshots(cls, snapshots: Iterable[IntervalSnapshot]) -> "StoredBars":
+        """Concatenates interval snapshots into one set of columns
+
+        Parameters
+        ----------
+        snapshots: Iterable[IntervalSnapshot]
+
+        Returns
+        -------
+        StoredBars
+        """
+        snapshots = list(snapshots)
+        if not snapshots:
+            return cls.from_rows([])
+
+        bars = cls(
+            item_ids=np.concatenate([x.ids for x in snapshots]),
+            timestamps=np.concatenate([np.full(len(x), x.timestamp, dtype=np.int64) for x in snapshots]),
+            avg_high=np.concatenate([x.avg_high for x in snapshots]),
+            high_volume=np.concatenate([x.high_volume for x in snapshots]),
+            avg_low=np.concatenate([x.avg_low for x in snapshots]),
+            low_volume=np.concatenate([x.low_volume for x in snapshots]),
+        )
+        return bars.take(np.lexsort((bars.timestamps, bars.item_ids)))
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "StoredBars":
+        """Reads the columns from a file written by ``save``
+
+        Parameters
+        ----------
+        path: str | os.PathLike
+
+        Returns
+        -------
+        StoredBars
+        """
+        with np.load(path) as columns:
+            return cls(**{name: columns[name] for name in cls.__dataclass_fields__})
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Writes the columns to a compressed NumPy ``.npz`` file
+
+        Parameters
+        ----------
+        path: str | os.PathLike
+        """
+        np.savez_compressed(path, **self.__dict__)
+
+    def take(self, rows: np.ndarray) -> "StoredBars":
+        """Creates the columns of only the selected rows
+
+        Parameters
+        ----------
+        rows: np.ndarray
+            Row positions or a boolean mask of the rows to keep
+
+        Returns
+        -------
+        StoredBars
+        """
+        return StoredBars(**{name: column[rows] for name, column in self.__dict__.items()})
+
+    def __len__(self) -> int:
+        return len(self.item_ids)
+
+
+class TimeseriesStore:
+    """Append-only SQLite store of the average prices and volumes of items at each timestep
+
+    Each bar is keyed by its timestep, item ID and timestamp. A bar that is already stored
+    is never overwritten, so the same timeseries or snapshot can be ingested repeatedly to
+    accumulate history beyond the 300 points returned by the API. The intervals whose
+    snapshot of every item has been ingested are recorded separately from the bars.
+    """
+
+    def __init__(self, path: str | os.PathLike = ":memory:"):
+        """Opens the store, creating the database if it does not exist
+
+        Parameters
+        ----------
+        path: str | os.PathLike (default = ":memory:")
+            Location of the SQLite database, the store is kept in memory if no path is given
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Closes the database connection"""
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _insert(self, rows, interval: tuple[int, int] = None) -> int:
+        with self._lock, self._connection:
+            before = self._connection.total_changes
+            self._connection.executemany(_INSERT, rows)
+            added = self._connection.total_changes - before
+            if interval is not None:
+                self._connection.execute(_INSERT_INTERVAL, interval)
+            return added
+
+    def _select(
+            self,
+            columns: tuple[str, ...],
+            where: str,
+            parameters: tuple,
+            order: str,
+            index: str = None
+    ) -> np.ndarray:
+        """Reads columns of the bars matching a condition in the given order
+
+        The bars are searched with the given index, or the primary key if no index is given.
+        Rows are fetched in chunks into a float array that doubles in size when it is full,
+        so a large range is never held as Python tuples all at once. NULL values are read as
+        NaN.
+        """
+        values = np.empty((_CHUNK, len(columns)), dtype=float)
+        filled = 0
+
+        source = "bars" if index is None else f"bars INDEXED BY {index}"
+        with self._lock:
+            cursor = self._connection.execute(
+                f"SELECT {', '.join(columns)} FROM {source} WHERE {where} ORDER BY {order}", parameters
+            )
+            while rows := cursor.fetchmany(_CHUNK):
+                if filled + len(rows) > len(values):
+                    values = np.resize(values, (2 * len(values), len(columns)))
+                values[filled:filled + len(rows)] = rows
+                filled += len(rows)
+
+        return values[:filled].T
+
+    def ingest(self, timeseries: Timeseries) -> int:
+        """Stores every bar of the timeseries that is not already stored
+
+        Parameters
+        ----------
+        timeseries: Timeseries
+            Timeseries of an item where the highest and lowest prices share their timestamps
+
+        Returns
+        -------
+        int
+            Number of new bars stored
+        """
+        timestamps = timeseries.highest.timestamps
+        if not np.array_equal(timestamps, timeseries.lowest.timestamps):
+            raise ValueError("highest and lowest prices must have the same timestamps")
+
+        return self._insert(zip(
+            repeat(timeseries.timestep),
+            repeat(timeseries.item.id),
+            timestamps.tolist(),
+            _column(timeseries.highest.prices),
+            _column(timeseries.highest.volumes),
+            _column(timeseries.lowest.prices),
+            _column(timeseries.lowest.volumes),
+        ))
+
+    def ingest_interval(self, contents: dict[str, dict], timestep: str, timestamp: int) -> int:
+        """Stores the bars of every item from a /5m or /1h response
+
+        Parameters
+        ----------
+        contents: dict[str, dict]
+            Average prices and volumes keyed by the item ID as returned by the API
+        timestep: str
+            Timestep of the endpoint the response was returned from
+        timestamp: int
+            Start of the interval as returned by the API
+
+        Returns
+        -------
+        int
+            Number of new bars stored
+        """
+        return self.ingest_snapshot(IntervalSnapshot.from_interval(contents, timestamp, _timestep(timestep)))
+
+    def ingest_snapshot(self, snapshot: IntervalSnapshot) -> int:
+        """Stores the bars of every item in an interval snapshot and records the interval as complete
+
+        Parameters
+        ----------
+        snapshot: IntervalSnapshot
+
+        Returns
+        -------
+        int
+            Number of new bars stored
+        """
+        return self._insert(zip(
+            repeat(snapshot.timestep),
+            snapshot.ids.tolist(),
+            repeat(snapshot.timestamp),
+            _column(snapshot.avg_high),
+            _column(snapshot.high_volume),
+            _column(snapshot.avg_low),
+            _column(snapshot.low_volume),
+        ), interval=(snapshot.timestep, snapshot.timestamp))
+
+    def get_timeseries(
+            self,
+            item: GrandExchangeItem,
+            timestep: str = "5m",
+            start: int = None,
+            end: int = None
+    ) -> Timeseries:
+        """Reads the stored timeseries of an item between two timestamps
+
+        Parameters
+        ----------
+        item: GrandExchangeItem
+            The item being read
+        timestep: str
+            Timestep parameter that must be one of: '5m', '1h', '6h'
+        start: int (default = None)
+            Earliest timestamp included, reads from the first stored bar if None is selected
+        end: int (default = None)
+            Latest timestamp included, reads up to the last stored bar if None is selected
+
+        Returns
+        -------
+        Timeseries
+        """
+        step = _timestep(timestep)
+        columns = self._select(
+            ("timestamp", "avg_high", "high_volume", "avg_low", "low_volume"),
+            "timestep = ? AND item_id = ? AND timestamp BETWEEN ? AND ?",
+            (step, item.id, *self._bounds(start, end)),
+            "timestamp",
+            # Without statistics the planner prefers scanning the whole time range of the primary key
+            index="bars_by_item",
+        )
+        timestamps = columns[0].astype(np.int64)
+        return Timeseries(
+            item=item,
+            timestep=step,
+            highest=PriceSeries.from_arrays(timestamps, columns[1], columns[2]),
+            lowest=PriceSeries.from_arrays(timestamps, columns[3], columns[4]),
+        )
+
+    def get_range(
+            self,
+            timestep: str = "5m",
+            start: int = None,
+            end: int = None,
+            item_ids: Iterable[int] = None
+    ) -> StoredBars:
+        """Reads the stored bars of many items between two timestamps
+
+        Parameters
+        ----------
+        timestep: str
+            Timestep parameter that must be one of: '5m', '1h', '6h'
+        start: int (default = None)
+            Earliest timestamp included, reads from the first stored bar if None is selected
+        end: int (default = None)
+            Latest timestamp included, reads up to the last stored bar if None is selected
+        item_ids: Iterable[int] (default = None)
+            Only reads the bars of these items, every item is read if None is selected
+
+        Returns
+        -------
+        StoredBars
+        """
+        where = "timestep = ? AND timestamp BETWEEN ? AND ?"
+        parameters = (_timestep(timestep), *self._bounds(start, end))
+        if item_ids is not None:
+            item_ids = [int(identity) for identity in item_ids]
+            where += f" AND item_id IN ({', '.join('?' * len(item_ids))})"
+            parameters += tuple(item_ids)
+
+        # Bars are read in the order they are stored, by timestamp, and then ordered by item
+        columns = self._select(
+            ("item_id", "timestamp", "avg_high", "high_volume", "avg_low", "low_volume"),
+            where,
+            parameters,
+            "timestamp, item_id",
+        )
+        bars = StoredBars.from_columns(columns)
+        return bars.take(np.lexsort((bars.timestamps, bars.item_ids)))
+
+    def latest_timestamp(self, timestep: str = "5m", item_id: int = None) -> int | None:
+        """Returns the timestamp of the most recent stored bar
+
+        Parameters
+        ----------
+        timestep: str
+            Timestep parameter that must be one of: '5m', '1h', '6h'
+        item_id: int (default = None)
+            Only considers the bars of this item, all items are considered if None is selected
+
+        Returns
+        -------
+        int | None
+            None is returned if nothing is stored
+        """
+        step = _timestep(timestep)
+        with self._lock:
+            if item_id is None:
+                row = self._connection.execute(
+                    "SELECT MAX(timestamp) FROM bars WHERE timestep = ?", (step,)
+                ).fetchone()
+            else:
+                row = self._connection.execute(
+                    "SELECT MAX(timestamp) FROM bars WHERE timestep = ? AND item_id = ?", (step, item_id)
+                ).fetchone()
+        return row[0]
+
+    def completed_intervals(self, timestep: str = "5m", start: int = None, end: int = None) -> set[int]:
+        """Returns the start of every interval between two timestamps with an ingested snapshot
+
+        Only snapshots of every item count, bars ingested from the timeseries of a single item
+        do not complete an interval.
+
+        Parameters
+        ----------
+        timestep: str
+            Timestep parameter that must be one of: '5m', '1h', '6h'
+        start: int (default = None)
+            Earliest timestamp included
+        end: int (default = None)
+            Latest timestamp included
+
+        Returns
+        -------
+        set[int]
+        """
+        step = _timestep(timestep)
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT timestamp FROM intervals WHERE timestep = ? AND timestamp BETWEEN ? AND ?",
+                (step, *self._bounds(start, end)),
+            ).fetchall()
+        return {timestamp for timestamp, in rows}
+
+    @staticmethod
+    def _bounds(start: int | None, end: int | None) -> tuple[int, int]:
+        return (
+            -(2 ** 63) if start is None else start,
+            2 ** 63 - 1 if end is None else end,
+        )
@@ -1,8 +1,10 @@
+import numpy as np
 from pydantic import BaseModel, validator
 
 from grandexchange import constants
 from grandexchange.items import GrandExchangeItem
 
+from dataclasses import dataclass
 from functools import total_ordering
 
 
@@ -45,6 +47,82 @@ class SaleTransaction(BaseModel):
         return sell_price - buy_price - values["tax"]
 
 
+@total_ordering
+@dataclass(slots=True, eq=False)
+class SaleRecord:
+    """Lightweight sale transaction for bulk calculations
+
+    Holds the same fields as ``SaleTransaction`` and calculates tax and profit in the same
+    way, but skips pydantic validation. Use ``create`` to build a record and
+    ``to_sale_transaction`` to convert it into a validated transaction.
+    """
+    item: GrandExchangeItem
+    full_buy_price: int
+    individual_sold_price: int
+    volume: int
+    tax: float
+    profit: float
+
+    @classmethod
+    def create(
+            cls,
+            item: GrandExchangeItem,
+            full_buy_price: int,
+            individual_sold_price: int,
+            volume: int | float
+    ) -> "SaleRecord":
+        """Creates the record, calculating its tax and profit
+
+        Prices and volume are converted to integers in the same way as ``SaleTransaction``.
+
+        Parameters
+        ----------
+        item: GrandExchangeItem
+            The item being sold
+        full_buy_price: int
+            Price paid for each item
+        individual_sold_price: int
+            Price each item is sold at
+        volume: int | float
+            Number of items sold
+
+        Returns
+        -------
+        SaleRecord
+        """
+        full_buy_price = int(full_buy_price)
+        individual_sold_price = int(individual_sold_price)
+        volume = int(volume)
+
+        tax = round(calculate_tax(individual_sold_price, volume), 0)
+        profit = individual_sold_price * volume - full_buy_price * volume - tax
+        return cls(item, full_buy_price, individual_sold_price, volume, tax, profit)
+
+    def to_sale_transaction(self) -> SaleTransaction:
+        """Converts the record into a validated sale transaction
+
+        Returns
+        -------
+        SaleTransaction
+        """
+        return SaleTransaction(
+            item=self.item,
+            full_buy_price=self.full_buy_price,
+            individual_sold_price=self.individual_sold_price,
+            volume=self.volume
+        )
+
+    def __lt__(self, other):
+        if not hasattr(other, "profit"):
+            raise ValueError()
+        return self.profit < other.profit
+
+    def __eq__(self, other):
+        if not hasattr(other, "profit"):
+            raise ValueError()
+        return self.profit == other.profit
+
+
 def price_below_tax_threshold(price: float) -> bool:
     """Returns true if the individual item price is below the threshold
 
@@ -82,3 +160,65 @@ def calculate_tax(price: float, volume: int) -> float:
         return constants.TAX_THRESHOLD
 
     return tax
+
+
+def price_below_tax_threshold_batch(prices: np.ndarray) -> np.ndarray:
+    """Element-wise version of ``price_below_tax_threshold``
+
+    Parameters
+    ----------
+    prices: np.ndarray
+        The prices of the items
+
+    Returns
+    -------
+    np.ndarray
+        Boolean array that is true where the item price is below the threshold
+    """
+    return np.asarray(prices) < constants.TAX_LOWER_ITEM_PRICE
+
+
+def calculate_tax_batch(prices: np.ndarray, volumes: np.ndarray | int) -> np.ndarray:
+    """Element-wise version of ``calculate_tax``
+
+    Parameters
+    ----------
+    prices: np.ndarray
+        The prices of the items
+    volumes: np.ndarray | int
+        Total number of items being sold, either for each price or for all of them
+
+    Returns
+    -------
+    np.ndarray
+    """
+    prices = np.asarray(prices)
+    tax = np.minimum(prices * volumes * constants.TAX_PERCENTAGE, constants.TAX_THRESHOLD)
+    return np.where(price_below_tax_threshold_batch(prices), 0.0, tax)
+
+
+def calculate_profit_batch(
+        full_buy_prices: np.ndarray,
+        individual_sold_prices: np.ndarray,
+        volumes: np.ndarray | int
+) -> np.ndarray:
+    """Calculates the profit of many sales after tax in the same way as ``SaleTransaction``
+
+    Parameters
+    ----------
+    full_buy_prices: np.ndarray
+        Price paid for each item
+    individual_sold_prices: np.ndarray
+        Price each item is sold at
+    volumes: np.ndarray | int
+        Number of items sold, either for each sale or for all of them
+
+    Returns
+    -------
+    np.ndarray
+    """
+    full_buy_prices = np.asarray(full_buy_prices)
+    individual_sold_prices = np.asarray(individual_sold_prices)
+
+    tax = np.round(calculate_tax_batch(individual_sold_prices, volumes), 0)
+    return individual_sold_prices * volumes - full_buy_prices * volumes - tax
@@ -1,7 +1,10 @@
 from datetime import datetime
 
 import pytest
+import requests
 
+from grandexchange import client as client_module
+from grandexchange.cache import LATEST_CACHE
 from grandexchange.items import Price, GrandExchangeItem, GrandExchangeItems, Timeseries, Offer
 
 TIMESTAMP = datetime.now()
@@ -332,3 +335,122 @@ def birds_nest_and_crushed_nest() -> (Offer, Offer):
         lowest=Price(timestamp=1, price=370),
     )
     return birds_nest, crushed_nest
+
+
+MAPPING = [
+    {"id": 0, "name": "Item", "value": 100, "highalch": 100, "lowalch": 50, "limit": 1_000, "examine": "An item"},
+    {"id": 1, "name": "Item2", "value": 100, "highalch": 100, "lowalch": 50, "limit": 1_000, "examine": "An item"},
+]
+
+
+class FakeResponse:
+    def __init__(self, payload=None, status_code=200, headers=None):
+        self._payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(response=self)
+
+
+class FakeAPI:
+    """Routes requests by the final path segment of the URL and records every call"""
+
+    def __init__(self, routes: dict):
+        self.routes = routes
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, **kwargs):
+        self.calls.append((url, params, headers))
+        route = self.routes[url.rsplit("/", 1)[-1]]
+        if callable(route):
+            return route(params, headers)
+        if isinstance(route, list):
+            return route.pop(0)
+        return route
+
+    def count(self, endpoint: str) -> int:
+        return sum(url.endswith(f"/{endpoint}") for url, _, _ in self.calls)
+
+
+@pytest.fixture
+def api(monkeypatch):
+    LATEST_CACHE.clear()
+    fake = FakeAPI({"mapping": FakeResponse(MAPPING, headers={"ETag": '"v1"'})})
+    monkeypatch.setattr(client_module.requests.Session, "get", lambda session, url, **kwargs: fake.get(url, **kwargs))
+    return fake
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(client_module.time, "sleep", delays.append)
+    return delays
+
+
+LATEST = {
+    "data": {
+        "0": {"high": 110, "highTime": 10, "low": 90, "lowTime": 11},
+        "1": {"high": 220, "highTime": 20, "low": None, "lowTime": None},
+        "2": {"high": 330, "highTime": 30, "low": 300, "lowTime": 31},
+    }
+}
+
+
+TIMESERIES = {
+    "data": [
+        {"timestamp": 300, "avgHighPrice": 110, "highPriceVolume": 5, "avgLowPrice": 90, "lowPriceVolume": 7},
+        {"timestamp": 600, "avgHighPrice": 120, "highPriceVolume": 3, "avgLowPrice": None, "lowPriceVolume": 0},
+    ]
+}
+
+
+@pytest.fixture
+def market() -> (GrandExchangeItems, dict):
+    """A catalog of items with a /latest payload covering cheap, expensive and unpriced items"""
+    items = GrandExchangeItems(items=[
+        GrandExchangeItem(name=f"Item{i}", id=i, value=1, highalch=i * 10, limit=i * 100)
+        for i in range(60)
+    ])
+    latest = {}
+    for i in range(60):
+        low = (i * 7919) % 5_000 + (50 if i % 3 else 600_000_000)
+        high = low + (i * 104729) % 900 - 300
+        latest[str(i)] = {"high": high, "highTime": i, "low": low, "lowTime": i}
+    latest["7"]["high"] = None
+    latest["8"]["low"] = None
+    latest["1000"] = {"high": 1_000, "highTime": 1, "low": 10, "lowTime": 1}
+    return items, latest
+
+
+INTERVAL = {
+    "data": {
+        "0": {"avgHighPrice": 115, "highPriceVolume": 4, "avgLowPrice": 95, "lowPriceVolume": 6},
+        "1": {"avgHighPrice": 225, "highPriceVolume": 1, "avgLowPrice": None, "lowPriceVolume": 0},
+    },
+    "timestamp": 900,
+}
+
+
+@pytest.fixture
+def potion_market() -> (GrandExchangeItems, dict):
+    """Three potion families, one missing a dose and one missing a price, alongside a non-potion item"""
+    names = [
+        "Prayer potion(1)", "Prayer potion(2)", "Prayer potion(3)", "Prayer potion(4)",
+        "Super restore(2)", "Super restore(3)", "Super restore(4)",
+        "Antipoison(1)", "Antipoison(2)", "Antipoison(3)", "Antipoison(4)",
+        "Nature rune",
+    ]
+    items = GrandExchangeItems(items=[
+        GrandExchangeItem(name=name, id=i, value=1, highalch=1) for i, name in enumerate(names)
+    ])
+    latest = {
+        str(i): {"high": 1_000 + 997 * i % 4_000, "highTime": 1, "low": 900 + 611 * i % 3_500, "lowTime": 1}
+        for i in range(len(names))
+    }
+    latest["9"]["low"] = None
+    return items, latest
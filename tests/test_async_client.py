@@ -0,0 +1,162 @@
+import asyncio
+
+import pytest
+import requests
+
+from grandexchange.async_client import AsyncClient, RateLimiter
+from grandexchange.store import StoredBars, TimeseriesStore
+from tests.fixtures import api, FakeResponse, TIMESERIES
+
+
+def test_get_timeseries_prices_many(api):
+    api.routes["timeseries"] = FakeResponse(TIMESERIES)
+
+    async def main():
+        async with AsyncClient("test", concurrency=2, rate_limit=1_000) as client:
+            return await client.get_timeseries_prices_many(["Item", "Item2", "Item"])
+
+    timeseries, failures = asyncio.run(main())
+    assert list(timeseries) == ["Item", "Item2"]
+    assert timeseries["Item2"].item.id == 1
+    assert failures == {}
+    assert api.count("mapping") == 1
+    assert api.count("timeseries") == 2
+
+
+def test_get_timeseries_prices_many_reports_failures(api):
+    def timeseries(params, headers):
+        if params["id"] == 1:
+            return FakeResponse(status_code=404)
+        return FakeResponse(TIMESERIES)
+
+    api.routes["timeseries"] = timeseries
+
+    async def main():
+        async with AsyncClient("test", concurrency=2, rate_limit=1_000) as client:
+            return await client.get_timeseries_prices_many(["Item", "Item2"])
+
+    found, failures = asyncio.run(main())
+    assert list(found) == ["Item"]
+    assert isinstance(failures["Item2"], requests.exceptions.HTTPError)
+
+
+def test_calls_run_on_dedicated_executor(api):
+    api.routes["timeseries"] = FakeResponse(TIMESERIES)
+
+    async def main():
+        async with AsyncClient("test", concurrency=64, rate_limit=1_000) as client:
+            await client.get_timeseries_prices("Item")
+            return client._executor
+
+    executor = asyncio.run(main())
+    assert executor._max_workers == 64
+    assert executor._shutdown
+
+
+def test_get_current_prices_by_id_skips_mapping(api):
+    api.routes["latest"] = FakeResponse({"data": {"0": {"high": 1, "highTime": 1, "low": 1, "lowTime": 1}}})
+
+    async def main():
+        async with AsyncClient("test") as client:
+            return await client.get_current_prices_by_id(0)
+
+    assert list(asyncio.run(main())) == [0]
+    assert api.count("mapping") == 0
+
+
+def test_rate_limiter_spaces_requests():
+    async def main():
+        limiter = RateLimiter(rate=100)
+        start = asyncio.get_running_loop().time()
+        for _ in range(5):
+            await limiter.acquire()
+        return asyncio.get_running_loop().time() - start
+
+    assert asyncio.run(main()) >= 0.03
+
+
+def test_rate_limiter_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        _ = RateLimiter(rate=0)
+
+
+def interval(failing: set[int]):
+    def route(params, headers):
+        if params["timestamp"] in failing:
+            return FakeResponse({}, status_code=404)
+        return FakeResponse({
+            "data": {"0": {"avgHighPrice": params["timestamp"], "highPriceVolume": 1,
+                           "avgLowPrice": None, "lowPriceVolume": 0}},
+            "timestamp": params["timestamp"],
+        })
+    return route
+
+
+def test_backfill_writes_each_interval(api, tmp_path):
+    api.routes["5m"] = interval({600})
+
+    async def main():
+        async with AsyncClient("test", rate_limit=1_000) as client:
+            return await client.backfill(1, 1_200, "5m", path=tmp_path / "bars")
+
+    failures = asyncio.run(main())
+    assert list(failures) == [600]
+    assert sorted(file.name for file in (tmp_path / "bars").iterdir()) == ["1200.npz", "300.npz", "900.npz"]
+    bars = StoredBars.load(tmp_path / "bars" / "900.npz")
+    assert bars.timestamps.tolist() == [900]
+    assert bars.avg_high.tolist() == [900]
+    assert api.count("mapping") == 0
+
+
+def test_backfill_resumes_from_written_intervals(api, tmp_path):
+    api.routes["5m"] = interval({600})
+
+    async def main():
+        async with AsyncClient("test", rate_limit=1_000) as client:
+            await client.backfill(0, 900, "5m", path=tmp_path)
+            api.routes["5m"] = interval(set())
+            return await client.backfill(0, 1_200, "5m", path=tmp_path)
+
+    assert asyncio.run(main()) == {}
+    assert api.count("5m") == 6
+
+
+def test_backfill_resumes_from_store(api):
+    api.routes["5m"] = interval({600})
+    store = TimeseriesStore()
+
+    async def main():
+        async with AsyncClient("test", rate_limit=1_000, store=store) as client:
+            await client.backfill(0, 900, "5m")
+            api.routes["5m"] = interval(set())
+            return await client.backfill(0, 1_200, "5m")
+
+    assert asyncio.run(main()) == {}
+    assert store.get_range("5m").timestamps.tolist() == [0, 300, 600, 900, 1_200]
+    assert api.count("5m") == 6
+
+
+def test_backfill_needs_an_output(api):
+    async def main():
+        async with AsyncClient("test") as client:
+            return await client.backfill(0, 900, "5m")
+
+    with pytest.raises(ValueError):
+        asyncio.run(main())
+
+
+def test_backfill_fetches_intervals_with_only_per_item_bars(api):
+    api.routes["5m"] = interval(set())
+    api.routes["timeseries"] = FakeResponse(TIMESERIES)
+    store = TimeseriesStore()
+
+    async def main():
+        async with AsyncClient("test", rate_limit=1_000, store=store) as client:
+            await client.get_timeseries_prices("Item2")
+            return await client.backfill(0, 900, "5m")
+
+    assert asyncio.run(main()) == {}
+    assert api.count("5m") == 4
+    bars = store.get_range("5m")
+    assert bars.item_ids.tolist() == [0, 0, 0, 0, 1, 1]
+    assert bars.timestamps.tolist() == [0, 300, 600, 900, 300, 600]
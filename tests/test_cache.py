@@ -0,0 +1,39 @@
+from grandexchange.cache import MappingCache, MappingSnapshot, SnapshotCache
+from tests.fixtures import an_item_type_1, an_item_type_2, multiple_items
+
+
+def test_mapping_snapshot_round_trip(tmp_path, multiple_items):
+    cache = MappingCache(tmp_path, "https://example.com", ttl=60)
+    cache.save(MappingSnapshot.from_items(multiple_items.items, etag='"abc"'))
+
+    snapshot = cache.load()
+    assert snapshot.to_items() == multiple_items.items
+    assert snapshot.validators() == {"If-None-Match": '"abc"'}
+
+
+def test_mapping_cache_is_stale_after_ttl(tmp_path, multiple_items):
+    cache = MappingCache(tmp_path, "https://example.com", ttl=60)
+    snapshot = MappingSnapshot.from_items(multiple_items.items)
+    assert cache.is_fresh(snapshot)
+
+    snapshot.fetched_at -= 61
+    assert not cache.is_fresh(snapshot)
+
+
+def test_mapping_cache_load_returns_none_when_missing(tmp_path):
+    cache = MappingCache(tmp_path, "https://example.com", ttl=60)
+    assert cache.load() is None
+
+
+def test_mapping_cache_load_returns_none_when_corrupt(tmp_path):
+    cache = MappingCache(tmp_path, "https://example.com", ttl=60)
+    cache.path.write_text("{not json")
+    assert cache.load() is None
+
+
+def test_snapshot_cache_expires():
+    cache = SnapshotCache()
+    cache.set("latest", {"0": {}})
+    assert cache.get("latest", ttl=60) == {"0": {}}
+    assert cache.get("latest", ttl=0) is None
+    assert cache.get("other", ttl=60) is None
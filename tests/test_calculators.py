@@ -1,6 +1,6 @@
 import pytest
 
-from grandexchange.transactions import SaleTransaction
+from grandexchange.transactions import SaleTransaction, SaleRecord
 from grandexchange.constants import (
     SAWMILL_COSTS,
     PLANK_MAKE_COSTS
@@ -14,8 +14,10 @@ from grandexchange.exceptions import (
 from grandexchange.calculators import (
     dosage,
     decant,
+    scan_decants,
     flip,
     high_alchemy,
+    scan_high_alchemy,
     check_skill_level,
     create_planks,
     repair_barrows,
@@ -25,11 +27,14 @@ from grandexchange.calculators import (
     create_unfinished,
     crush,
     best_flip,
+    rank_flips,
+    best_flip_stream,
     ZAHURS_FEE,
     WESLEYS_FEE
 )
 
 from tests.fixtures import (
+    potion_market,
     nature_rune_item,
     nature_rune_offer,
     alchable,
@@ -46,8 +51,11 @@ from tests.fixtures import (
     components_for_product,
     grimy_and_clean_herbs,
     herb_and_unfinished,
-    birds_nest_and_crushed_nest
+    birds_nest_and_crushed_nest,
+    market
 )
+from grandexchange.items import GrandExchangeItem, GrandExchangeItems
+from grandexchange.snapshot import PriceSnapshot
 
 
 @pytest.mark.parametrize("name, dose", [
@@ -157,6 +165,23 @@ def test_crush(birds_nest_and_crushed_nest):
     assert sale.full_buy_price == nest.lowest.price + 1 + WESLEYS_FEE
 
 
+def test_fast_processing_returns_sale_records(
+        log_and_planks,
+        grimy_and_clean_herbs,
+        herb_and_unfinished,
+        birds_nest_and_crushed_nest
+):
+    for calculator, (material, product) in [
+        (create_planks, log_and_planks),
+        (clean_herbs, grimy_and_clean_herbs),
+        (create_unfinished, herb_and_unfinished),
+        (crush, birds_nest_and_crushed_nest),
+    ]:
+        sale = calculator(material, product, 1, fast=True)
+        assert isinstance(sale, SaleRecord)
+        assert sale.to_sale_transaction() == calculator(material, product, 1)
+
+
 def test_check_skill_level_uses_default_value_with_no_argument():
     @check_skill_level
     def to_be_decorated(level: int = 1) -> int:
@@ -202,3 +227,172 @@ def test_repair_barrows_set_returns_correct_profit(
         barrows_set
     )
     assert sale.profit == 1421645
+
+
+@pytest.mark.parametrize("volume, top_n", [(1, 5), (10, 20), (1_000, 100)])
+def test_rank_flips_matches_best_flip(market, volume, top_n):
+    items, latest = market
+    snapshot = PriceSnapshot.from_latest(latest)
+    offers = [
+        offer for offer in snapshot.offers(items)
+        if None not in (offer.highest.price, offer.lowest.price)
+    ]
+
+    expected = best_flip(offers, volume=volume, top_n=top_n)
+    ranked = rank_flips(snapshot, items, volume=volume, top_n=top_n)
+
+    assert [sale.item.id for sale in ranked] == [sale.item.id for sale in expected]
+    assert [sale.profit for sale in ranked] == [sale.profit for sale in expected]
+    assert [sale.tax for sale in ranked] == [sale.tax for sale in expected]
+
+
+def test_rank_flips_keeps_snapshot_order_of_ties_at_the_cut():
+    items = GrandExchangeItems(items=[GrandExchangeItem(name=f"Item{i}", id=i, value=1) for i in range(200)])
+    snapshot = PriceSnapshot.from_latest({
+        str(i): {"high": 1_000 if i % 50 == 49 else 500, "highTime": 1, "low": 100, "lowTime": 1}
+        for i in range(200)
+    })
+
+    expected = best_flip(list(snapshot.offers(items)), top_n=40)
+    ranked = rank_flips(snapshot, items, top_n=40)
+    assert [sale.item.id for sale in ranked] == [sale.item.id for sale in expected]
+    assert [sale.item.id for sale in ranked][4:] == list(range(36))
+
+
+def test_rank_flips_skips_unpriced_and_unknown_items(market):
+    items, latest = market
+    ranked = rank_flips(PriceSnapshot.from_latest(latest), items, top_n=100)
+    assert {sale.item.id for sale in ranked}.isdisjoint({7, 8, 1000})
+    assert len(ranked) == 58
+
+
+@pytest.mark.parametrize("top_n", [0, 1, 10, 100])
+def test_best_flip_stream_matches_best_flip(market, top_n):
+    items, latest = market
+    offers = list(PriceSnapshot.from_latest(latest).offers(items))
+    priced = [offer for offer in offers if None not in (offer.highest.price, offer.lowest.price)]
+
+    ranking = best_flip_stream(iter(offers), volume=5, top_n=top_n)
+    expected = best_flip(priced, volume=5, top_n=top_n)
+
+    assert [sale.item.id for sale in ranking.flips] == [sale.item.id for sale in expected]
+    assert ranking.skipped == 2
+
+
+def test_best_flip_stream_skips_offers_without_a_sell_price(market):
+    items, latest = market
+    latest = {**latest, "1": {"high": 0, "highTime": 1, "low": 0, "lowTime": 1}}
+    offers = list(PriceSnapshot.from_latest(latest).offers(items))
+    unpriced = sum(None in (offer.highest.price, offer.lowest.price) for offer in offers)
+
+    ranking = best_flip_stream(offers, top_n=10)
+    assert ranking.skipped == unpriced + 1
+    assert 1 not in [sale.item.id for sale in ranking.flips]
+    assert ranking.flips == rank_flips(PriceSnapshot.from_latest(latest), items, top_n=10)
+
+
+def test_fast_calculators_return_sale_records(
+        potions,
+        full_repaired_barrows_set,
+        full_degraded_barrows_set,
+        barrows_set,
+        nature_rune_offer,
+        nature_rune_offer_with_profit
+):
+    sale = repair_barrows_set(full_repaired_barrows_set, full_degraded_barrows_set, barrows_set, fast=True)
+    assert isinstance(sale, SaleRecord)
+    assert sale.profit == 1421645
+
+    decanted = decant(potions, 1, 1, fast=True)
+    assert [record.to_sale_transaction() for record in decanted] == decant(potions, 1, 1)
+
+    flips = best_flip([nature_rune_offer, nature_rune_offer_with_profit], top_n=1, fast=True)
+    assert flips[0].individual_sold_price == 999
+
+
+def test_decant_does_not_mutate_offers(potions):
+    _ = decant(potions, 2, 3)
+    assert all("dose" not in potion.attributes for potion in potions)
+
+
+def test_decant_requires_starting_dose(potions):
+    with pytest.raises(ValueError):
+        _ = decant(potions[1:], 1, 1)
+
+
+def as_tuple(sale):
+    return sale.item.id, sale.full_buy_price, sale.individual_sold_price, sale.volume, sale.profit
+
+
+@pytest.mark.parametrize("volume", [1, 7])
+def test_scan_decants_matches_decant(potion_market, volume):
+    items, latest = potion_market
+    snapshot = PriceSnapshot.from_latest(latest)
+    table = scan_decants(snapshot, items, volume=volume)
+
+    expected = []
+    for family in ("Prayer potion", "Super restore", "Antipoison"):
+        offers = [offer for offer in snapshot.offers(items) if offer.item.name.startswith(family)]
+        for offer in offers:
+            if offer.lowest.price is None:
+                continue
+            priced = [other for other in offers if other is offer or other.highest.price is not None]
+            expected += decant(priced, dosage(offer.item.name), volume)
+
+    assert sorted(map(as_tuple, table.sales(items))) == sorted(map(as_tuple, expected))
+    assert list(table.profit) == sorted(table.profit, reverse=True)
+    assert len(table) == 12 + 6 + 9
+    assert set(table.family) == {"Prayer potion", "Super restore", "Antipoison"}
+    assert latest["9"]["low"] is None
+
+
+def test_scan_decants_top_n(potion_market):
+    items, latest = potion_market
+    snapshot = PriceSnapshot.from_latest(latest)
+    table = scan_decants(snapshot, items, top_n=3)
+
+    assert len(table) == 3
+    assert list(table.profit) == list(scan_decants(snapshot, items).profit[:3])
+    assert [sale.profit for sale in table.sales(items, fast=True)] == list(table.profit)
+
+
+def test_scan_decants_skips_charged_items(potion_market):
+    items, latest = potion_market
+    for dose in range(1, 5):
+        items.add_item(GrandExchangeItem(name=f"Amulet of glory({dose})", id=200 + dose, value=1))
+        latest = {**latest, str(200 + dose): {"high": 20_000 * dose, "highTime": 1, "low": 100, "lowTime": 1}}
+
+    table = scan_decants(PriceSnapshot.from_latest(latest), items)
+    assert "Amulet of glory" not in set(table.family)
+    assert len(table) == 12 + 6 + 9
+
+
+def test_scan_decants_empty_snapshot(potion_market):
+    items, _ = potion_market
+    assert len(scan_decants(PriceSnapshot.from_latest({}), items)) == 0
+
+
+@pytest.mark.parametrize("volume", [None, 250])
+def test_scan_high_alchemy_matches_high_alchemy(market, nature_rune_offer, volume):
+    items, latest = market
+    snapshot = PriceSnapshot.from_latest(latest)
+    table = scan_high_alchemy(nature_rune_offer.lowest.price, snapshot, items, volume=volume, top_n=100)
+
+    expected = {}
+    for offer in snapshot.offers(items):
+        if offer.lowest.price is None:
+            continue
+        casts = offer.item.limit if volume is None else min(offer.item.limit, volume)
+        expected[offer.item.id] = high_alchemy(nature_rune_offer, offer, casts)
+
+    assert dict(zip(table.ids.tolist(), table.total_profit.tolist())) == expected
+    assert list(table.total_profit) == sorted(expected.values(), reverse=True)
+    assert len(scan_high_alchemy(nature_rune_offer.lowest.price, snapshot, items)) == 10
+
+
+def test_scan_high_alchemy_without_buy_limit(nature_rune_offer):
+    items = GrandExchangeItems(items=[GrandExchangeItem(name="Item", id=0, value=1, highalch=500)])
+    snapshot = PriceSnapshot.from_latest({"0": {"high": 1, "highTime": 1, "low": 100, "lowTime": 1}})
+
+    assert scan_high_alchemy(100, snapshot, items).total_profit.tolist() == [298]
+    assert scan_high_alchemy(100, snapshot, items, volume=3).total_profit.tolist() == [894]
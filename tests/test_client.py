@@ -0,0 +1,230 @@
+import numpy as np
+import pytest
+import requests
+
+from grandexchange.client import Client
+from grandexchange.exceptions import MalformedResponseError
+from grandexchange.items import Price
+from grandexchange.store import TimeseriesStore
+from tests.fixtures import api, sleeps, FakeResponse, INTERVAL, LATEST, TIMESERIES
+
+
+def test_client_loads_mapping(api):
+    client = Client("test")
+    assert [item.name for item in client.items.items] == ["Item", "Item2"]
+    assert client.items.get_item_by_id(1).high_alch == 100
+
+
+def test_client_mapping_cache_warm_start_skips_network(api, tmp_path):
+    Client("test", cache_dir=tmp_path)
+    client = Client("test", cache_dir=tmp_path)
+
+    assert api.count("mapping") == 1
+    assert client.items.get_item_by_name("Item2").limit == 1_000
+
+
+def test_client_mapping_cache_revalidates_stale_snapshot(api, tmp_path):
+    Client("test", cache_dir=tmp_path, cache_ttl=0)
+    api.routes["mapping"] = FakeResponse(status_code=304)
+    client = Client("test", cache_dir=tmp_path, cache_ttl=0)
+
+    _, _, headers = api.calls[-1]
+    assert headers["If-None-Match"] == '"v1"'
+    assert len(client.items.items) == 2
+
+
+def test_lazy_client_defers_mapping(api):
+    client = Client("test", lazy=True)
+    assert api.count("mapping") == 0
+
+    _ = client.items
+    _ = client.items
+    assert api.count("mapping") == 1
+
+
+def test_get_current_prices_by_id_skips_mapping(api):
+    api.routes["latest"] = FakeResponse(LATEST)
+    client = Client("test", lazy=True)
+
+    prices = client.get_current_prices_by_id([1, 5])
+    assert api.count("mapping") == 0
+    assert list(prices) == [1]
+    assert prices[1][0].price == 220
+    assert prices[1][1].price is None
+
+
+def test_send_request_retries_with_retry_after(api, sleeps):
+    api.routes["latest"] = [
+        FakeResponse(status_code=429, headers={"Retry-After": "2"}),
+        FakeResponse(status_code=503),
+        FakeResponse(LATEST),
+    ]
+    client = Client("test", lazy=True, backoff_factor=1)
+
+    prices = client.get_current_prices_by_id(0)
+    assert prices[0][0].price == 110
+    assert sleeps[0] == 2
+    assert 0 <= sleeps[1] <= 2
+
+
+def test_send_request_raises_after_retries(api, sleeps):
+    api.routes["latest"] = FakeResponse(status_code=500)
+    client = Client("test", lazy=True, retries=2)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        _ = client.get_current_prices_by_id(0)
+    assert api.count("latest") == 3
+    assert len(sleeps) == 2
+
+
+def test_send_request_does_not_retry_client_errors(api, sleeps):
+    api.routes["latest"] = FakeResponse(status_code=404)
+    client = Client("test", lazy=True)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        _ = client.get_current_prices_by_id(0)
+    assert api.count("latest") == 1
+
+
+def test_get_timeseries_prices_batch_reports_failures(api):
+    def timeseries(params, headers):
+        if params["id"] == 1:
+            return FakeResponse(status_code=404)
+        return FakeResponse(TIMESERIES)
+
+    api.routes["timeseries"] = timeseries
+    client = Client("test")
+
+    found, failures = client.get_timeseries_prices_batch(["Item", "Item2"], max_workers=2)
+    assert list(found) == ["Item"]
+    assert len(found["Item"].highest) == 2
+    assert isinstance(failures["Item2"], requests.exceptions.HTTPError)
+
+
+def test_latest_ttl_shares_one_download(api):
+    api.routes["latest"] = FakeResponse(LATEST)
+    client = Client("test", latest_ttl=60)
+    other = Client("test", lazy=True, latest_ttl=60)
+
+    _ = client.get_current_prices("Item")
+    _ = client.get_current_prices()
+    _ = other.get_current_prices_by_id(2)
+    assert api.count("latest") == 1
+
+
+def test_latest_is_downloaded_every_call_without_ttl(api):
+    api.routes["latest"] = FakeResponse(LATEST)
+    client = Client("test")
+
+    _ = client.get_current_prices("Item")
+    _ = client.get_current_prices("Item")
+    assert api.count("latest") == 2
+
+
+def test_get_current_prices_by_name(api):
+    api.routes["latest"] = FakeResponse(LATEST)
+    client = Client("test")
+
+    offers = client.get_current_prices(["Item2", "Missing"])
+    assert [offer.item.id for offer in offers] == [1]
+    assert offers[0].highest.price == 220
+    assert offers[0].lowest.timestamp is None
+
+
+def test_get_current_prices_skips_ids_missing_from_mapping(api):
+    api.routes["latest"] = FakeResponse(LATEST)
+    client = Client("test")
+
+    offers = client.get_current_prices()
+    assert [offer.item.id for offer in offers] == [0, 1]
+
+
+def test_get_current_prices_columnar_skips_mapping(api):
+    api.routes["latest"] = FakeResponse(LATEST)
+    client = Client("test", lazy=True)
+
+    snapshot = client.get_current_prices_columnar()
+    assert api.count("mapping") == 0
+    assert snapshot.ids.tolist() == [0, 1, 2]
+
+
+def test_watch_latest_yields_changes(api, sleeps):
+    updated = {"data": {**LATEST["data"], "2": {"high": 335, "highTime": 32, "low": 300, "lowTime": 31}}}
+    api.routes["latest"] = [FakeResponse(LATEST), FakeResponse(updated), FakeResponse(updated)]
+    client = Client("test", lazy=True, latest_ttl=60)
+
+    deltas = list(client.watch_latest(interval=60, polls=3))
+    assert [delta.changed for delta in deltas] == [3, 1, 0]
+    assert deltas[1].changes.high.tolist() == [335]
+    assert len(sleeps) == 2
+    assert api.count("latest") == 3
+
+
+def test_get_timeseries_prices(api):
+    api.routes["timeseries"] = FakeResponse(TIMESERIES)
+    client = Client("test")
+
+    timeseries = client.get_timeseries_prices("Item2", "1h")
+    _, params, _ = api.calls[-1]
+    assert params == {"id": 1, "timestep": "1h"}
+    assert timeseries.time_range == (300, 600)
+    assert timeseries.total_volume == 8
+    assert [x.price for x in timeseries.lowest] == [90, None]
+
+
+def test_client_store_accumulates_timeseries(api):
+    api.routes["timeseries"] = FakeResponse(TIMESERIES)
+    api.routes["5m"] = FakeResponse(INTERVAL)
+    client = Client("test", store=TimeseriesStore())
+
+    client.get_timeseries_prices("Item", "5m")
+    client.get_latest_timeseries_prices("5m")
+
+    stored = client.get_stored_timeseries("Item", "5m")
+    assert stored.highest.timestamps.tolist() == [300, 600, 900]
+    assert stored.highest.prices.tolist() == [110, 120, 115]
+
+
+def test_get_stored_timeseries_requires_store(api):
+    with pytest.raises(ValueError):
+        Client("test").get_stored_timeseries("Item")
+
+
+def test_get_latest_timeseries_prices_uses_server_timestamp(api):
+    api.routes["1h"] = FakeResponse({**INTERVAL, "data": {**INTERVAL["data"], "1000": {}}})
+    client = Client("test")
+
+    timeseries = client.get_latest_timeseries_prices("1h")
+    assert [x.item.name for x in timeseries] == ["Item", "Item2"]
+    assert all(x.timestep == 60 for x in timeseries)
+    assert timeseries[0].latest_offer().highest == Price(timestamp=900, price=115, volume=4)
+    assert timeseries[1].latest_offer().lowest == Price(timestamp=900, price=None, volume=0)
+
+
+def test_get_latest_timeseries_prices_columnar(api):
+    api.routes["5m"] = FakeResponse(INTERVAL)
+    client = Client("test", lazy=True)
+
+    snapshot = client.get_latest_timeseries_prices_columnar("5m")
+    assert client._items is None
+    assert snapshot.timestamp == 900
+    assert snapshot.ids.tolist() == [0, 1]
+    assert snapshot.avg_high.tolist() == [115, 225]
+    assert np.isnan(snapshot.avg_low[1])
+
+
+def test_get_latest_timeseries_prices_requires_timestamp(api):
+    api.routes["5m"] = FakeResponse({"data": INTERVAL["data"]})
+    with pytest.raises(MalformedResponseError):
+        Client("test").get_latest_timeseries_prices("5m")
+
+
+def test_get_latest_timeseries_prices_at_timestamp(api):
+    api.routes["1h"] = FakeResponse({**INTERVAL, "timestamp": 3_600})
+    client = Client("test")
+
+    assert client.get_latest_timeseries_prices_columnar("1h", timestamp=3_600).timestamp == 3_600
+    assert api.calls[-1][1] == {"timestamp": 3_600}
+
+    with pytest.raises(ValueError):
+        client.get_latest_timeseries_prices_columnar("1h", timestamp=300)
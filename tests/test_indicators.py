@@ -0,0 +1,80 @@
+import math
+
+import numpy as np
+import pytest
+
+from grandexchange.exceptions import WindowLargerThanArrayError
+from grandexchange.indicators import (
+    sma,
+    ema,
+    rolling_std,
+    vwap,
+    RollingWindow,
+    ExponentialAverage,
+)
+
+PRICES = np.array([1_000, 1_100, np.nan, 900, 1_200, 1_050, np.nan, np.nan, 1_300, 1_250])
+VOLUMES = np.array([10, 5, 3, np.nan, 8, 2, 4, 1, 6, 7])
+
+
+def naive(values: np.ndarray, window: int, func) -> list[float]:
+    result = []
+    for end in range(len(values)):
+        if end < window - 1:
+            result.append(math.nan)
+            continue
+        chunk = values[end - window + 1:end + 1]
+        chunk = chunk[~np.isnan(chunk)]
+        result.append(func(chunk) if len(chunk) else math.nan)
+    return result
+
+
+@pytest.mark.parametrize("window", [1, 3, 10])
+def test_sma_matches_naive_window(window):
+    np.testing.assert_allclose(sma(PRICES, window), naive(PRICES, window, np.mean))
+
+
+@pytest.mark.parametrize("window", [1, 3, 10])
+def test_rolling_std_matches_naive_window(window):
+    np.testing.assert_allclose(rolling_std(PRICES, window), naive(PRICES, window, np.std), atol=1e-9)
+
+
+def test_vwap_skips_missing_prices_and_volumes():
+    result = vwap(PRICES, VOLUMES, 3)
+    assert math.isnan(result[0])
+    assert result[2] == pytest.approx((1_000 * 10 + 1_100 * 5) / 15)
+    assert math.isnan(vwap(PRICES[6:8], VOLUMES[6:8], 2)[1])
+
+
+def test_ema_carries_missing_values_forward():
+    result = ema(PRICES, 3)
+    assert result[0] == 1_000
+    assert result[1] == pytest.approx(1_050)
+    assert result[2] == result[1]
+
+
+def test_window_larger_than_array_raises_error():
+    with pytest.raises(WindowLargerThanArrayError):
+        _ = sma(PRICES, 11)
+
+
+def test_rolling_window_matches_vectorised_indicators():
+    rolling = RollingWindow(4)
+    expected_sma = sma(PRICES, 4)
+    expected_std = rolling_std(PRICES, 4)
+    expected_vwap = vwap(PRICES, VOLUMES, 4)
+
+    for index, (price, volume) in enumerate(zip(PRICES.tolist(), VOLUMES.tolist())):
+        rolling.update(price, volume)
+        if rolling.full:
+            np.testing.assert_allclose(
+                [rolling.sma, rolling.std, rolling.vwap],
+                [expected_sma[index], expected_std[index], expected_vwap[index]],
+                atol=1e-9
+            )
+
+
+def test_exponential_average_matches_ema():
+    average = ExponentialAverage(5)
+    updates = [average.update(price) for price in PRICES.tolist()]
+    np.testing.assert_allclose(updates, ema(PRICES, 5))
@@ -1,4 +1,9 @@
-from tests.fixtures import an_item_type_1, an_item_type_2, multiple_items
+import numpy as np
+import pytest
+
+from grandexchange.items import GrandExchangeItem, GrandExchangeItems, Price, PriceSeries, Timeseries
+
+from tests.fixtures import an_item_type_1, an_item_type_2, multiple_items, potion_market
 
 
 def test_search_for(multiple_items):
@@ -26,3 +31,165 @@ def test_get_item_by_name(multiple_items):
 def test_get_item_by_names(multiple_items):
     items = multiple_items.items
     assert items == multiple_items.get_item_by_names([item.name for item in items])
+
+
+def test_get_item_by_id_returns_none_when_missing(multiple_items):
+    assert multiple_items.get_item_by_id(-1) is None
+
+
+def test_add_item_updates_lookups(multiple_items):
+    item = GrandExchangeItem(name="Item3", id=2, value=100)
+    multiple_items.add_item(item)
+    assert multiple_items.get_item_by_id(2) == item
+    assert multiple_items.get_item_by_name("Item3") == item
+
+
+def test_appended_item_is_indexed(multiple_items):
+    item = GrandExchangeItem(name="Item3", id=2, value=100)
+    multiple_items.items.append(item)
+    assert multiple_items.get_item_by_id(2) == item
+
+
+@pytest.fixture
+def priced_timeseries(an_item_type_1):
+    return Timeseries(
+        item=an_item_type_1,
+        highest=[
+            Price(timestamp=300 * i, price=price, volume=volume)
+            for i, (price, volume) in enumerate([(100, 5), (110, 2), (None, 0), (130, 4), (90, 1)])
+        ],
+        lowest=[Price(timestamp=300 * i, price=80, volume=1) for i in range(5)]
+    )
+
+
+def test_timeseries_sma(priced_timeseries):
+    np.testing.assert_allclose(priced_timeseries.sma(2), [np.nan, 105, 110, 130, 110])
+    np.testing.assert_allclose(priced_timeseries.sma(2, side="lowest")[1:], [80] * 4)
+
+
+def test_timeseries_side_must_be_valid(priced_timeseries):
+    with pytest.raises(ValueError):
+        _ = priced_timeseries.sma(2, side="middle")
+
+
+def test_timeseries_rolling_window_updates(priced_timeseries):
+    rolling = priced_timeseries.rolling_window(3)
+    assert rolling.sma == 110
+
+    new_price = Price(timestamp=1_500, price=170, volume=3)
+    priced_timeseries.highest.append(new_price)
+    rolling.update(new_price.price, new_price.volume)
+    assert rolling.sma == priced_timeseries.sma(3)[-1] == 130
+
+
+def test_timeseries_exponential_average_updates(priced_timeseries):
+    average = priced_timeseries.exponential_average(3)
+    assert average.value == priced_timeseries.ema(3)[-1]
+
+
+def test_price_series_append_and_iterate():
+    series = PriceSeries()
+    for i in range(20):
+        series.append(Price(timestamp=i, price=None if i % 5 == 0 else i * 10, volume=i))
+
+    assert len(series) == 20
+    assert series[-1] == Price(timestamp=19, price=190, volume=19)
+    assert series[0].price is None
+    assert [x.timestamp for x in series[-3:]] == [17, 18, 19]
+    assert np.isnan(series.prices[5])
+
+
+def test_price_series_equals_list_of_prices():
+    prices = [Price(timestamp=0, price=1200, volume=1000), Price(timestamp=300, price=None, volume=None)]
+    assert PriceSeries(prices) == prices
+
+
+def test_timeseries_converts_list_of_prices(an_item_type_1):
+    timeseries = Timeseries(
+        item=an_item_type_1,
+        timestep=5,
+        highest=[Price(timestamp=i * 300, price=100 - i, volume=i) for i in range(5)],
+        lowest=[Price(timestamp=i * 300, price=90 - i, volume=None) for i in range(5)],
+    )
+
+    assert isinstance(timeseries.highest, PriceSeries)
+    assert timeseries.time_range == (0, 1_200)
+    assert timeseries.total_volume == 10
+    assert timeseries.latest_offer().highest.price == 96
+    assert len(timeseries.as_offers()) == 5
+
+
+def test_timeseries_json_round_trip(an_item_type_1):
+    timeseries = Timeseries(
+        item=an_item_type_1,
+        timestep=5,
+        highest=[Price(timestamp=0, price=100, volume=1), Price(timestamp=300, price=None, volume=None)],
+        lowest=[Price(timestamp=0, price=90, volume=2), Price(timestamp=300, price=89, volume=None)],
+    )
+
+    parsed = Timeseries.parse_raw(timeseries.json(by_alias=True))
+    assert parsed.item == timeseries.item
+    assert parsed.highest == timeseries.highest
+    assert parsed.lowest == timeseries.lowest
+    assert timeseries.dict()["highest"][1] == {"timestamp": 300, "price": None, "volume": None}
+    assert Timeseries.schema()["properties"]["highest"]["type"] == "array"
+
+
+def test_search_for_is_updated_by_add_item(multiple_items):
+    assert multiple_items.search_for("Brand new item") == []
+
+    item = GrandExchangeItem(name="Brand new item", id=999, value=1)
+    multiple_items.add_item(item)
+    assert multiple_items.search_for("brand new item", limit=1) == [item]
+
+
+def test_potion_families(potion_market):
+    items, _ = potion_market
+    families = items.potion_families()
+
+    assert list(families) == ["Prayer potion", "Super restore", "Antipoison"]
+    assert list(families["Super restore"]) == [2, 3, 4]
+    assert items.get_potion_family("Prayer potion(3)")[1].name == "Prayer potion(1)"
+    assert items.get_potion_family("Nature rune") is None
+
+    items.add_item(GrandExchangeItem(name="Super restore(1)", id=100, value=1))
+    assert list(items.get_potion_family("Super restore")) == [1, 2, 3, 4]
+
+
+def test_potion_families_skip_charged_items(potion_market):
+    items, _ = potion_market
+    for dose in range(1, 5):
+        items.add_item(GrandExchangeItem(name=f"Amulet of glory({dose})", id=200 + dose, value=1))
+
+    assert "Amulet of glory" not in items.potion_families()
+    assert items.get_potion_family("Amulet of glory(4)") is None
+
+
+def test_get_degraded_item():
+    items = GrandExchangeItems(items=[
+        GrandExchangeItem(name="Dharok's helm", id=0, value=1),
+        GrandExchangeItem(name="Dharok's helm 0", id=1, value=1),
+        GrandExchangeItem(name="Dharok's greataxe", id=2, value=1),
+    ])
+
+    assert items.get_degraded_item(0).id == 1
+    assert items.get_degraded_item(2) is None
+
+
+def test_catalog_columns(multiple_items):
+    columns = multiple_items.columns()
+    assert columns is multiple_items.columns()
+    assert columns.ids.tolist() == sorted(item.id for item in multiple_items.items)
+
+    rows, known = columns.rows(np.array([columns.ids[-1], 10_000]))
+    assert known.tolist() == [True, False]
+    assert rows[0] == len(columns.ids) - 1
+
+    multiple_items.add_item(GrandExchangeItem(name="New item", id=10_000, value=1))
+    assert multiple_items.columns().limit[-1] == -1
+
+
+def test_from_items_keeps_items(multiple_items):
+    items = GrandExchangeItems.from_items(multiple_items.items)
+    assert items.items[0] is multiple_items.items[0]
+    assert items.get_item_by_id(multiple_items.items[1].id) is multiple_items.items[1]
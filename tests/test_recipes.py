@@ -0,0 +1,148 @@
+import pytest
+
+from grandexchange.calculators import clean_herbs, combiner
+from grandexchange.constants import PLANK_MAKE_COSTS, ZAHURS_FEE
+from grandexchange.items import GrandExchangeItem, GrandExchangeItems, Offer, Price
+from grandexchange.recipes import Recipe, RecipeBook, load_fees, load_recipes, load_godsword_recipes
+from grandexchange.snapshot import PriceSnapshot
+
+PRICES = {
+    "Grimy ranarr weed": (6_000, 5_900),
+    "Ranarr weed": (6_100, 6_000),
+    "Vial of water": (5, 3),
+    "Ranarr potion (unf)": (7_300, 7_200),
+    "Godsword blade": (60_000, 59_000),
+    "Bandos hilt": (9_000_000, 8_900_000),
+    "Bandos godsword": (9_200_000, 9_100_000),
+    "Grimy torstol": (None, 7_000),
+}
+
+
+@pytest.fixture
+def herblore_market() -> (GrandExchangeItems, PriceSnapshot):
+    items = GrandExchangeItems(items=[
+        GrandExchangeItem(name=name, id=i, value=1) for i, name in enumerate([*PRICES, "Torstol"])
+    ])
+    snapshot = PriceSnapshot.from_latest({
+        str(i): {"high": high, "highTime": 1, "low": low, "lowTime": 1}
+        for i, (high, low) in enumerate(PRICES.values())
+    })
+    return items, snapshot
+
+
+def offer(items, snapshot, name):
+    item = items.get_item_by_name(name)
+    return Offer(item=item, highest=snapshot.prices(item.id)[0], lowest=snapshot.prices(item.id)[1])
+
+
+def test_load_recipes():
+    recipes = load_recipes()
+    assert len({recipe.name for recipe in recipes}) == len(recipes)
+    assert all(recipe.quantity >= 1 and recipe.fee >= 0 for recipe in recipes)
+
+
+def test_recipes_share_calculator_fees():
+    recipes = {recipe.name: recipe for recipe in load_recipes()}
+    assert recipes["Clean ranarr weed"].fee == ZAHURS_FEE
+    assert recipes["Oak plank (plank make)"].fee == PLANK_MAKE_COSTS["Oak logs"]
+    assert load_fees()["zahur"] == ZAHURS_FEE
+
+
+def test_load_godsword_recipes():
+    recipes = {recipe.name: recipe for recipe in load_godsword_recipes()}
+    assert recipes["Godsword blade"].inputs == {"Godsword shards 1 & 2": 1, "Godsword shard 3": 1}
+    assert recipes["Bandos godsword"].inputs == {"Godsword blade": 1, "Bandos hilt": 1}
+    assert len(recipes) == 6
+
+
+def test_recipe_book_compiles_known_items(herblore_market):
+    items, _ = herblore_market
+    book = RecipeBook.load(items)
+
+    assert list(book.names) == ["Clean ranarr weed", "Clean torstol", "Ranarr potion (unf)", "Bandos godsword"]
+    assert len(book.unresolved) == len(load_recipes()) + len(load_godsword_recipes()) - 4
+
+
+def test_recipe_book_matches_calculators(herblore_market):
+    items, snapshot = herblore_market
+    table = RecipeBook.load(items).evaluate(snapshot)
+    profit = dict(zip(table.names, table.profit))
+
+    cleaned = clean_herbs(offer(items, snapshot, "Grimy ranarr weed"), offer(items, snapshot, "Ranarr weed"), 1)
+    assert profit["Clean ranarr weed"] == cleaned.profit
+
+    # combiner sells at the highest price + 1 where recipes sell at the highest price - 1
+    parts = [offer(items, snapshot, "Godsword blade"), offer(items, snapshot, "Bandos hilt")]
+    combined = combiner(parts, offer(items, snapshot, "Bandos godsword"))
+    assert profit["Bandos godsword"] == combined.profit - 2
+
+    unfinished = 7_300 - 1 - (6_000 + 1 + 3 + 1 + 200)
+    assert profit["Ranarr potion (unf)"] == unfinished - round((7_300 - 1) * 0.01)
+
+    assert "Clean torstol" not in profit
+    assert list(table.profit) == sorted(table.profit, reverse=True)
+
+
+def test_recipe_book_volume_and_quantity(herblore_market):
+    items, snapshot = herblore_market
+    book = RecipeBook([Recipe(name="Vials", inputs={"Ranarr weed": 2}, output="Vial of water", quantity=3, fee=1)], items)
+
+    table = book.evaluate(snapshot, volume=10)
+    assert table.cost.tolist() == [(2 * 6_001 + 1) * 10]
+    assert table.revenue.tolist() == [4 * 30]
+    assert table.tax.tolist() == [0]
+
+
+def test_recipe_book_empty_snapshot(herblore_market):
+    items, _ = herblore_market
+    assert len(RecipeBook.load(items).evaluate(PriceSnapshot.from_latest({}))) == 0
+
+
+def test_best_chains_follows_profitable_steps(herblore_market):
+    items, snapshot = herblore_market
+    book = RecipeBook.load(items)
+    chains = book.best_chains(snapshot)
+    found = {items.get_item_by_id(start).name: (steps, profit) for start, steps, profit in
+             zip(chains.start_ids.tolist(), chains.steps, chains.profit.tolist())}
+
+    table = book.evaluate(snapshot)
+    single = dict(zip(table.names, table.profit))
+
+    # Cleaning alone loses money but the unfinished potion makes the chain worthwhile
+    assert single["Clean ranarr weed"] < 0
+    steps, profit = found["Grimy ranarr weed"]
+    assert steps == ("Clean ranarr weed", "Ranarr potion (unf)")
+    assert profit == (7_299 - 73) - 200 - 4 - 200 - 5_901
+
+    # A single step chain is priced in the same way as evaluate
+    assert found["Bandos hilt"] == (("Bandos godsword",), single["Bandos godsword"])
+
+    assert "Grimy torstol" not in found
+    assert list(chains.profit) == sorted(chains.profit, reverse=True)
+
+
+def test_best_chains_limits_steps(herblore_market):
+    items, snapshot = herblore_market
+    chains = RecipeBook.load(items).best_chains(snapshot, max_steps=1)
+    steps = dict(zip(chains.start_ids.tolist(), chains.steps))
+
+    assert all(len(path) == 1 for path in chains.steps)
+    assert steps.get(items.get_item_by_name("Grimy ranarr weed").id) is None
+
+
+def test_best_chains_bounds_cycles():
+    items = GrandExchangeItems(items=[
+        GrandExchangeItem(name="A", id=0, value=1), GrandExchangeItem(name="B", id=1, value=1),
+    ])
+    snapshot = PriceSnapshot.from_latest({
+        "0": {"high": 50, "highTime": 1, "low": 10, "lowTime": 1},
+        "1": {"high": 50, "highTime": 1, "low": 10, "lowTime": 1},
+    })
+    book = RecipeBook([
+        Recipe(name="A to B", inputs={"A": 1}, output="B", quantity=2),
+        Recipe(name="B to A", inputs={"B": 1}, output="A", quantity=2),
+    ], items)
+
+    chains = book.best_chains(snapshot, max_steps=3)
+    assert chains.steps[0] == ("A to B", "B to A", "A to B")
+    assert chains.profit[0] == 8 * 49 - 11
@@ -0,0 +1,31 @@
+import pytest
+from fuzzywuzzy import fuzz
+
+from grandexchange.search import NameIndex
+
+NAMES = [
+    "Abyssal whip", "Abyssal dagger", "Abyssal tentacle", "Dragon dagger", "Dragon dagger(p++)",
+    "Rune platebody", "Rune platelegs", "Rune plateskirt", "Prayer potion(4)", "Prayer potion(3)",
+    "Super restore(4)", "Saradomin brew(4)", "Nature rune", "Law rune", "Cosmic rune", "Grimy ranarr weed",
+    "Ranarr weed", "Ranarr potion (unf)", "Oak plank", "Teak plank", "Mahogany plank", "", "Ahrim's hood 0",
+]
+
+
+@pytest.mark.parametrize("query", ["abyssal whip", "Rune", "prayer potion", "ranar", "plank", "x", "", "AHRIM'S HOOD"])
+@pytest.mark.parametrize("threshold", [0, 40, 60, 75, 90, 100])
+def test_search_matches_brute_force(query, threshold):
+    index = NameIndex(NAMES)
+    expected = {
+        position for position, name in enumerate(NAMES)
+        if fuzz.ratio(name.lower(), query.lower()) >= threshold
+    }
+    assert {position for position, _ in index.search(query, threshold)} == expected
+
+
+def test_search_ranks_by_ratio_with_limit():
+    index = NameIndex(NAMES)
+    matches = index.search("rune plate", threshold=50)
+    ratios = [ratio for _, ratio in matches]
+
+    assert ratios == sorted(ratios, reverse=True)
+    assert index.search("rune plate", threshold=50, limit=2) == matches[:2]
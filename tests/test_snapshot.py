@@ -0,0 +1,59 @@
+import numpy as np
+
+from grandexchange.snapshot import PriceSnapshot, MISSING
+from tests.fixtures import an_item_type_1, an_item_type_2, multiple_items, LATEST
+
+
+def test_price_snapshot_from_latest():
+    snapshot = PriceSnapshot.from_latest(LATEST["data"])
+    assert len(snapshot) == 3
+    assert snapshot.ids.tolist() == [0, 1, 2]
+    assert snapshot.high.tolist() == [110, 220, 330]
+    assert snapshot.low.tolist() == [90, MISSING, 300]
+    assert snapshot.priced.tolist() == [True, False, True]
+
+
+def test_price_snapshot_prices_restores_missing_values():
+    snapshot = PriceSnapshot.from_latest(LATEST["data"])
+    highest, lowest = snapshot.prices(1)
+    assert highest.price == 220
+    assert lowest.price is None
+    assert lowest.timestamp is None
+    assert snapshot.prices(5) is None
+
+
+def test_price_snapshot_select():
+    snapshot = PriceSnapshot.from_latest(LATEST["data"]).select([2, 5, 0])
+    assert snapshot.ids.tolist() == [2, 0]
+    assert snapshot.row(0) == 1
+
+
+def test_price_snapshot_offers_skip_unknown_items(multiple_items):
+    snapshot = PriceSnapshot.from_latest(LATEST["data"])
+    offers = list(snapshot.offers(multiple_items))
+    assert [offer.item.id for offer in offers] == [0, 1]
+    assert offers[0].lowest.price == 90
+    assert snapshot.to_offer(2, multiple_items) is None
+
+
+def test_price_snapshot_take_mask():
+    snapshot = PriceSnapshot.from_latest(LATEST["data"])
+    priced = snapshot.take(snapshot.priced)
+    assert priced.ids.tolist() == [0, 2]
+    assert priced.high.dtype == np.int64
+
+
+def test_price_snapshot_changed_since():
+    previous = PriceSnapshot.from_latest(LATEST["data"])
+    current = PriceSnapshot.from_latest({
+        "2": {"high": 330, "highTime": 30, "low": 300, "lowTime": 31},
+        "0": {"high": 110, "highTime": 10, "low": 95, "lowTime": 40},
+        "1": {"high": 220, "highTime": 20, "low": None, "lowTime": None},
+        "9": {"high": 1, "highTime": 1, "low": 1, "lowTime": 1},
+    })
+    assert current.changed_since(previous).ids.tolist() == [0, 9]
+
+
+def test_price_snapshot_changed_since_empty_snapshot():
+    current = PriceSnapshot.from_latest(LATEST["data"])
+    assert len(current.changed_since(PriceSnapshot.from_latest({}))) == 3
@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from grandexchange.items import Price, Timeseries
+from grandexchange import store as store_module
+from grandexchange.store import TimeseriesStore
+from tests.fixtures import an_item_type_1, INTERVAL
+
+
+@pytest.fixture
+def timeseries(an_item_type_1):
+    return Timeseries(
+        item=an_item_type_1,
+        timestep=5,
+        highest=[Price(timestamp=i * 300, price=100 + i, volume=i) for i in range(4)],
+        lowest=[Price(timestamp=i * 300, price=None if i == 2 else 90 + i, volume=1) for i in range(4)],
+    )
+
+
+def test_store_round_trip(timeseries):
+    store = TimeseriesStore()
+    assert store.ingest(timeseries) == 4
+
+    stored = store.get_timeseries(timeseries.item, "5m")
+    assert stored.highest == timeseries.highest
+    assert stored.lowest == timeseries.lowest
+    assert stored.timestep == 5
+
+
+def test_store_deduplicates_on_item_and_timestamp(timeseries):
+    store = TimeseriesStore()
+    store.ingest(timeseries)
+    assert store.ingest(timeseries) == 0
+    assert len(store.get_timeseries(timeseries.item, "5m").highest) == 4
+    assert len(store.get_timeseries(timeseries.item, "1h").highest) == 0
+
+
+def test_store_range_queries(timeseries):
+    store = TimeseriesStore()
+    store.ingest(timeseries)
+
+    stored = store.get_timeseries(timeseries.item, "5m", start=300, end=600)
+    assert stored.highest.timestamps.tolist() == [300, 600]
+    assert store.latest_timestamp("5m") == 900
+    assert store.latest_timestamp("5m", item_id=99) is None
+
+
+def test_store_ingests_intervals(tmp_path, timeseries):
+    with TimeseriesStore(tmp_path / "history.db") as store:
+        store.ingest(timeseries)
+        assert store.ingest_interval(INTERVAL["data"], "5m", INTERVAL["timestamp"]) == 1
+
+        bars = store.get_range("5m", start=900)
+        assert bars.item_ids.tolist() == [0, 1]
+        assert bars.avg_high.tolist() == [103, 225]
+        assert np.isnan(bars.avg_low[1])
+
+    with TimeseriesStore(tmp_path / "history.db") as store:
+        assert len(store.get_range("5m")) == 5
+
+
+def test_store_reads_range_in_chunks(monkeypatch, timeseries):
+    monkeypatch.setattr(store_module, "_CHUNK", 3)
+    store = TimeseriesStore()
+    store.ingest(timeseries)
+    store.ingest_interval(INTERVAL["data"], "5m", 1_200)
+
+    bars = store.get_range("5m")
+    assert bars.item_ids.tolist() == [0, 0, 0, 0, 0, 1]
+    assert bars.timestamps.tolist() == [0, 300, 600, 900, 1_200, 1_200]
+    assert np.isnan(bars.avg_low[2])
+    stored = store.get_timeseries(timeseries.item, "5m")
+    assert stored.highest == [*timeseries.highest, Price(timestamp=1_200, price=115, volume=4)]
+
+
+def test_store_filters_range_by_item(timeseries):
+    store = TimeseriesStore()
+    store.ingest(timeseries)
+    store.ingest_interval(INTERVAL["data"], "5m", 1_200)
+
+    assert store.get_range("5m", item_ids=[1]).timestamps.tolist() == [1_200]
+    assert store.get_range("5m", start=600, item_ids=np.array([0])).timestamps.tolist() == [600, 900, 1_200]
+    assert len(store.get_range("5m", item_ids=[])) == 0
+
+
+def test_store_reads_by_time_and_by_item_with_indexes():
+    store = TimeseriesStore()
+
+    def plan(query, *parameters):
+        return " ".join(row[-1] for row in store._connection.execute(f"EXPLAIN QUERY PLAN {query}", parameters))
+
+    by_time = plan("SELECT * FROM bars WHERE timestep = ? AND timestamp BETWEEN ? AND ?", 5, 0, 300)
+    by_item = plan(
+        "SELECT * FROM bars INDEXED BY bars_by_item WHERE timestep = ? AND item_id = ? AND timestamp BETWEEN ? AND ?",
+        5, 0, 0, 300,
+    )
+    assert "PRIMARY KEY (timestep=? AND timestamp>? AND timestamp<?)" in by_time
+    assert "INDEX bars_by_item (timestep=? AND item_id=? AND timestamp>? AND timestamp<?)" in by_item
+
+
+def test_store_records_completed_intervals(timeseries):
+    store = TimeseriesStore()
+    store.ingest(timeseries)
+    assert store.completed_intervals("5m") == set()
+
+    store.ingest_interval(INTERVAL["data"], "5m", INTERVAL["timestamp"])
+    store.ingest_interval(INTERVAL["data"], "5m", INTERVAL["timestamp"])
+    assert store.completed_intervals("5m") == {900}
+    assert store.completed_intervals("5m", end=600) == set()
+    assert store.completed_intervals("1h") == set()
+
+
+def test_store_rejects_unknown_timestep():
+    with pytest.raises(ValueError):
+        TimeseriesStore().get_range("2m")
@@ -1,6 +1,14 @@
+import numpy as np
 import pytest
 
-from grandexchange.transactions import SaleTransaction
+from grandexchange.transactions import (
+    SaleTransaction,
+    SaleRecord,
+    calculate_tax,
+    calculate_tax_batch,
+    calculate_profit_batch,
+    price_below_tax_threshold_batch,
+)
 from tests.fixtures import nature_rune_item
 
 
@@ -108,3 +116,61 @@ def test_price_sorting_with_unrelated_item(nature_rune_item):
     other = "A"
     with pytest.raises(ValueError):
         _ = sorted([first, other])
+
+
+@pytest.mark.parametrize("full_buy_price, individual_sold_price, volume", [
+    (1_000, 1_000, 1),
+    (50, 99, 10),
+    (101.9, 150.7, 2.5),
+    (400_000_000, 600_000_000, 3),
+])
+def test_sale_record_matches_sale_transaction(nature_rune_item, full_buy_price, individual_sold_price, volume):
+    transaction = dict(
+        item=nature_rune_item,
+        full_buy_price=full_buy_price,
+        individual_sold_price=individual_sold_price,
+        volume=volume
+    )
+    record = SaleRecord.create(**transaction)
+    sale = SaleTransaction(**transaction)
+
+    assert (record.full_buy_price, record.individual_sold_price, record.volume, record.tax, record.profit) == (
+        sale.full_buy_price, sale.individual_sold_price, sale.volume, sale.tax, sale.profit
+    )
+    assert record.to_sale_transaction().dict() == sale.dict()
+
+
+def test_sale_record_sorting(nature_rune_item):
+    low_profit = SaleRecord.create(nature_rune_item, 100, 100, 1)
+    high_profit = SaleRecord.create(nature_rune_item, 100, 200, 1)
+    assert [low_profit, high_profit] == sorted([high_profit, low_profit])
+
+    with pytest.raises(ValueError):
+        _ = sorted([low_profit, "A"])
+
+
+def test_price_below_tax_threshold_batch():
+    assert price_below_tax_threshold_batch([99, 100, 101]).tolist() == [True, False, False]
+
+
+def test_calculate_tax_batch_matches_calculate_tax():
+    prices = np.array([0, 50, 99, 100, 150, 10_000, 2_000_000_000])
+    volumes = np.array([1, 10, 1_000, 1, 3, 25, 2])
+    expected = [calculate_tax(price, volume) for price, volume in zip(prices.tolist(), volumes.tolist())]
+    assert calculate_tax_batch(prices, volumes).tolist() == expected
+
+
+def test_calculate_tax_batch_with_scalar_volume():
+    assert calculate_tax_batch(np.array([99, 1_000]), 10).tolist() == [0, 100]
+
+
+def test_calculate_profit_batch_matches_sale_transaction(nature_rune_item):
+    buy = np.array([1_000, 50, 99, 400_000_000, 150])
+    sell = np.array([1_000, 99, 99, 600_000_000, 250])
+    volumes = np.array([1, 10, 10, 3, 7])
+
+    expected = [
+        SaleTransaction(item=nature_rune_item, full_buy_price=b, individual_sold_price=s, volume=v).profit
+        for b, s, v in zip(buy.tolist(), sell.tolist(), volumes.tolist())
+    ]
+    assert calculate_profit_batch(buy, sell, volumes).tolist() == expected